@@ -1,14 +1,25 @@
-import streamlit as st
-import pandas as pd
-import plotly.express as px
-import seaborn as sns
-import matplotlib.pyplot as plt
-import folium
-from streamlit_folium import folium_static
-import plotly.graph_objects as go
-from wordcloud import WordCloud
-from io import StringIO
 import time
+script_started = time.perf_counter()
+import io
+import uuid
+import streamlit as st
+from chart_jobs import ChartJobs
+from charts import CHART_REGISTRY, CHART_TYPES, build_chart, build_live_chart
+from downsampling import DOWNSAMPLE_METHODS, DEFAULT_POINT_BUDGET
+from dataset_cache import FrameMemory
+from figure_cache import FigureCache
+from frame_view import DEFAULT_PAGE_SIZE, PAGE_SIZES, column_profile, page_count, page_slice, sort_positions
+from ingest import file_hash, load_file
+from live_source import DEFAULT_REFRESH_SECONDS, LiveSource
+from xlsx_reader import sheet_headers
+from preaggregate import DISTRIBUTION_MODES
+from trace_encoding import DEFAULT_WEBGL_THRESHOLD, payload_sizes
+from lazy_imports import import_timings, lazy_import, record_timing
+from perf import PERF_LOG_PATH, collect_spans, peak_rss_bytes, record_spans, span, write_perf_log
+record_timing("app imports", time.perf_counter() - script_started)
+
+# How often a run waiting on a background chart checks whether it has finished
+CHART_JOB_POLL_SECONDS = 0.1
 
 # Custom CSS for pointer cursor on select boxes
 st.markdown("""
@@ -180,222 +191,294 @@ def display_chart_info(chart_type):
     st.sidebar.write("**Usage:**")
     st.sidebar.write(info.get("usage", ""))
 
-# Function to generate visualizations
+# Frames loaded in this process, shared by every session
+@st.cache_resource
+def get_loaded_frames():
+    return FrameMemory()
+
+# Dataset hash of an upload and its parse settings, hashed once per uploaded file
+def upload_hash(uploaded_file, sheet=None, columns=None):
+    hashes = st.session_state.setdefault("upload_hashes", {})
+    key = (uploaded_file.file_id, sheet, tuple(sorted(columns)) if columns else None)
+    if key not in hashes:
+        hashes[key] = file_hash(uploaded_file, uploaded_file.name, sheet, columns)
+    return hashes[key]
+
+# Custom function to load an upload. The Arrow dataset cache is the persistent layer; frames already
+# loaded in this process are reused as they are, without the pickled copy st.cache_data would make.
+def load_data(uploaded_file, sheet=None, columns=None, progress=None):
+    started = time.perf_counter()
+    dataset_hash = upload_hash(uploaded_file, sheet, columns)
+    frames = get_loaded_frames()
+    entry = frames.get(dataset_hash)
+    if entry is not None:
+        df, stats = entry
+        seconds = time.perf_counter() - started
+        return df, {**stats, "source": "memory", "seconds": seconds,
+                    "rows_per_second": len(df) / seconds if seconds > 0 else float("inf"), "peak_memory_bytes": None}
+    df, stats = load_file(uploaded_file, uploaded_file.name, sheet, columns, progress, dataset_hash=dataset_hash)
+    frames.put(dataset_hash, (df, stats))
+    return df, stats
+
+# Worksheet names and their column headers, read without parsing the sheets
+@st.cache_data
+def excel_sheet_headers(uploaded_file):
+    return sheet_headers(uploaded_file)
+
+# Custom function to pick the worksheet and columns of an Excel upload; returns (sheet, columns) once loaded
+def choose_excel_selection(uploaded_file):
+    headers = excel_sheet_headers(uploaded_file)
+    sheet = st.selectbox("Worksheet", list(headers), key="excel_sheet")
+    with st.form("excel_columns"):
+        columns = st.multiselect("Columns to Load (leave empty to load all)", headers[sheet], key=f"excel_columns_{sheet}")
+        if st.form_submit_button("Load Sheet"):
+            st.session_state["excel_selection"] = (uploaded_file.file_id, sheet, tuple(columns))
+    selection = st.session_state.get("excel_selection")
+    if selection is None or selection[:2] != (uploaded_file.file_id, sheet):
+        return None
+    return selection[1], list(selection[2])
+
+# Custom function to parse an Excel sheet with a progress bar; reruns reuse the loaded frame
+def load_excel_data(uploaded_file, sheet, columns):
+    progress_bar = st.progress(0.0, text=f"Reading {sheet}...")
+    try:
+        return load_data(uploaded_file, sheet, columns,
+                         progress=lambda fraction: progress_bar.progress(fraction, text=f"Reading {sheet}... {fraction:.0%}"))
+    finally:
+        progress_bar.empty()
+
+# Custom function to report ingest throughput and memory
+def display_load_stats(stats):
+    peak = "" if stats["peak_memory_bytes"] is None else f"peak RSS +{stats['peak_memory_bytes'] / 1e6:,.1f} MB, "
+    st.caption(
+        f"Loaded {stats['rows']:,} rows from {stats['source']} in {stats['seconds']:.2f}s "
+        f"({stats['rows_per_second']:,.0f} rows/s, {peak}frame {stats['memory_bytes'] / 1e6:,.1f} MB)"
+    )
+
+# Shared figure cache, kept across reruns and sessions
+@st.cache_resource
+def get_figure_cache():
+    return FigureCache()
+
+# Background chart builds shared by every session
+@st.cache_resource
+def get_chart_jobs():
+    return ChartJobs()
+
+# Build, serialize and cache one figure; runs on a chart job thread, so it must not draw anything
+def build_figure_entry(job, figure_cache, key, build):
+    fig, caption = build()
+    job.set_stage("serializing")
+    with span("serialize") as record:
+        figure_json = fig.to_json()
+        binary_bytes, text_bytes = payload_sizes(figure_json)
+        record["payload_bytes"] = binary_bytes
+    if text_bytes:
+        payload = f"{binary_bytes / 1e6:,.2f} MB sent with binary arrays (≈{text_bytes / 1e6:,.2f} MB as JSON text)"
+        caption = f"{caption} · {payload}" if caption else payload
+    # The built figure itself is cached: redrawing it from JSON would validate every array again,
+    # costing about as much as building it
+    return figure_cache.put(key, fig, binary_bytes, caption)
+
+# Custom function to wait for a chart job with a progress bar. The wait polls, so a widget change
+# interrupts it at once and the next run's spec replaces the job.
+def wait_for_chart_job(job):
+    progress_bar = st.progress(job.progress(), text="Updating chart...")
+    try:
+        with span("wait"):
+            while not job.done():
+                progress_bar.progress(job.progress(), text=f"Updating chart: {job.stage}...")
+                time.sleep(CHART_JOB_POLL_SECONDS)
+        return job.result()
+    finally:
+        progress_bar.empty()
+
+# Custom function to draw a Plotly figure, building it in the background only when its spec is not cached.
+# While a new figure is built, the last one drawn in this session stays on screen.
+def show_figure(dataset_hash, chart_type, spec, build):
+    figure_cache = get_figure_cache()
+    key = (dataset_hash, chart_type, spec)
+    chart_area = st.empty()
+    entry = figure_cache.get(key)
+    if entry is None:
+        slot = (st.session_state.setdefault("perf_session", uuid.uuid4().hex), "chart")
+        job = get_chart_jobs().submit(slot, key, lambda job: build_figure_entry(job, figure_cache, key, build))
+        if not job.done():
+            last = figure_cache.peek(st.session_state.get("last_figure_key"))
+            if last is not None:
+                chart_area.plotly_chart(last["figure"])
+            entry = wait_for_chart_job(job)
+        else:
+            entry = job.result()
+        record_spans(job.spans)
+    with span("render", payload_bytes=entry["bytes"]):
+        chart_area.plotly_chart(entry["figure"])
+    st.session_state["last_figure_key"] = key
+    if entry["caption"]:
+        st.caption(entry["caption"])
+
+# Term counts per dataset and column, so restyling a word cloud never re-tokenizes the corpus
 @st.cache_data
-def load_data(uploaded_file):
-    if uploaded_file.name.endswith(".csv"):
-        return pd.read_csv(uploaded_file)
-    elif uploaded_file.name.endswith(".xlsx"):
-        return pd.read_excel(uploaded_file)
+def cached_word_frequencies(_df, dataset_hash, text_col):
+    return dict(lazy_import("word_freq").word_frequencies(_df[text_col]))
+
+# Sorted row order per dataset and column, so paging through a sorted view never re-sorts
+@st.cache_data(max_entries=4)
+def cached_sort_positions(_df, dataset_hash, column, ascending):
+    return sort_positions(_df, column, ascending)
 
-def generate_visualizations(df, chart_type):
+# Column profile per dataset, computed once however often the panel is opened
+@st.cache_data
+def cached_column_profile(_df, dataset_hash):
+    return column_profile(_df)
+
+# Custom function to show one page of the dataset, sorted server-side, so only the visible rows reach the browser
+def display_dataframe_page(df, dataset_hash):
+    sort_col, order_col, size_col, page_col = st.columns(4)
+    sort_by = sort_col.selectbox("Sort By", ["(original order)"] + df.columns.tolist(), key="view_sort")
+    ascending = order_col.radio("Order", ["Ascending", "Descending"], key="view_order", horizontal=True) == "Ascending"
+    page_size = size_col.selectbox("Rows per Page", PAGE_SIZES, index=PAGE_SIZES.index(DEFAULT_PAGE_SIZE), key="view_page_size")
+    pages = page_count(len(df), page_size)
+    page = page_col.number_input(f"Page (of {pages:,})", min_value=1, max_value=pages, value=1, step=1, key="view_page")
+
+    positions = None
+    if sort_by != "(original order)":
+        positions = cached_sort_positions(df, dataset_hash, sort_by, ascending)
+    rows = page_slice(df, page, page_size, positions)
+    st.dataframe(rows)
+    first = (page - 1) * page_size
+    st.caption(f"Rows {min(first + 1, len(df)):,}–{first + len(rows):,} of {len(df):,}")
+
+# Custom function to report figure cache and chart job effectiveness in the sidebar
+def display_figure_cache_stats():
+    stats = get_figure_cache().stats()
+    st.sidebar.caption(
+        f"Figure cache: {stats['hits']:,} hits, {stats['misses']:,} misses, "
+        f"{stats['entries']:,} figures, {stats['bytes'] / 1e6:,.1f} MB"
+    )
+    jobs = get_chart_jobs().stats()
+    st.sidebar.caption(
+        f"Chart jobs: {jobs['submitted']:,} built in the background, {jobs['shared']:,} shared, "
+        f"{jobs['cancelled']:,} cancelled, {jobs['active']:,} in progress"
+    )
+
+# Custom function to show startup and first-use import costs in the sidebar
+def display_startup_timings():
+    with st.sidebar.expander("Startup Timings"):
+        for name, seconds in import_timings.items():
+            st.write(f"{name}: {seconds * 1000:,.0f} ms")
+
+# Custom function to show this run's stage timings, memory and payload sizes, in the sidebar by default
+def display_performance_panel(spans, container=st.sidebar):
+    with container.expander("Performance", expanded=True):
+        st.dataframe([
+            {
+                "stage": record["name"],
+                "ms": round(record["seconds"] * 1000, 1),
+                "RSS MB": round(record["rss_bytes"] / 1e6, 1) if "rss_bytes" in record else None,
+                "Δ RSS MB": round(record["rss_delta_bytes"] / 1e6, 1) if "rss_delta_bytes" in record else None,
+                "payload KB": round(record["payload_bytes"] / 1e3, 1) if "payload_bytes" in record else None,
+            }
+            for record in spans
+        ], hide_index=True)
+        peak = peak_rss_bytes()
+        st.caption(("Peak RSS unavailable" if peak is None else f"Peak RSS {peak / 1e6:,.0f} MB")
+                   + (f" · logged to {PERF_LOG_PATH}" if PERF_LOG_PATH else " · set DATAVIS_PERF_LOG to log runs"))
+
+# Custom function to draw one parameter widget from a chart's registry entry
+def draw_widget(widget, columns, key):
+    if widget["kind"] == "column":
+        return st.selectbox(widget["label"], columns, key=key)
+    elif widget["kind"] == "columns":
+        return st.multiselect(widget["label"], columns, key=key)
+    elif widget["kind"] == "choice":
+        return st.selectbox(widget["label"], widget["options"], key=key)
+    elif widget["kind"] == "number":
+        return st.number_input(widget["label"], key=key, **widget["kwargs"])
+    elif widget["kind"] == "slider":
+        return st.slider(widget["label"], key=key, **widget["kwargs"])
+
+# Custom function to draw a chart from its column mapping with the renderer that fits its figure type
+def render_chart(build, chart_type, params, render_options, dataset_hash):
+    renderer = CHART_REGISTRY[chart_type]["renderer"]
+    if renderer == "folium":
+        m, caption = build()
+        # The map is rendered to HTML once here, so its payload can be measured without rendering it twice
+        with span("serialize") as record:
+            html = m.get_root().render()
+            record["payload_bytes"] = len(html.encode())
+        with span("render", payload_bytes=record["payload_bytes"]):
+            st.iframe(html, width=700, height=500)
+    elif renderer == "matplotlib":
+        fig, caption = build()
+        # Same PNG settings st.pyplot uses, kept in hand so the payload can be measured
+        with span("serialize") as record:
+            buffer = io.BytesIO()
+            fig.savefig(buffer, format="png", bbox_inches="tight", dpi=200)
+            record["payload_bytes"] = buffer.getbuffer().nbytes
+        with span("render", payload_bytes=record["payload_bytes"]):
+            st.image(buffer.getvalue(), width="stretch")
+    else:
+        spec = (tuple((name, tuple(value) if isinstance(value, list) else value) for name, value in params.items()),
+                tuple(sorted(render_options.items())))
+        show_figure(dataset_hash, chart_type, spec, build)
+        return
+    if caption:
+        st.caption(caption)
+
+# For a live source `df` is None: charts with live builders draw from its aggregates,
+# and the whole frame is only assembled for views that need every row
+def generate_visualizations(df, chart_type, render_options, dataset_hash, live_source=None):
     st.write("## Generated Visualizations")
+    frame = live_source.frame if live_source is not None else lambda: df
 
     if st.checkbox("Show DataFrame"):
-        st.write(df)
-
-    columns = df.columns.tolist()
-
-    if chart_type == "Bar Chart":
-        x_col = st.selectbox("Select X Column", columns, key="bar_x")
-        y_col = st.selectbox("Select Y Column", columns, key="bar_y")
-        fig = px.bar(df, x=x_col, y=y_col)
-        st.plotly_chart(fig)
-
-    elif chart_type == "Line Chart":
-        x_col = st.selectbox("Select X Column", columns, key="line_x")
-        y_col = st.selectbox("Select Y Column", columns, key="line_y")
-        fig = px.line(df, x=x_col, y=y_col)
-        st.plotly_chart(fig)
-
-    elif chart_type == "Pie Chart":
-        names_col = st.selectbox("Select Names Column", columns, key="pie_names")
-        values_col = st.selectbox("Select Values Column", columns, key="pie_values")
-        fig = px.pie(df, names=names_col, values=values_col)
-        st.plotly_chart(fig)
-
-    elif chart_type == "Histogram":
-        x_col = st.selectbox("Select X Column", columns, key="hist_x")
-        fig = px.histogram(df, x=x_col)
-        st.plotly_chart(fig)
-
-    elif chart_type == "Scatter Plot":
-        x_col = st.selectbox("Select X Column", columns, key="scatter_x")
-        y_col = st.selectbox("Select Y Column", columns, key="scatter_y")
-        fig = px.scatter(df, x=x_col, y=y_col)
-        st.plotly_chart(fig)
-
-    elif chart_type == "Bubble Chart":
-        x_col = st.selectbox("Select X Column", columns, key="bubble_x")
-        y_col = st.selectbox("Select Y Column", columns, key="bubble_y")
-        size_col = st.selectbox("Select Size Column", columns, key="bubble_size")
-        fig = px.scatter(df, x=x_col, y=y_col, size=size_col)
-        st.plotly_chart(fig)
-
-    elif chart_type == "Area Chart":
-        x_col = st.selectbox("Select X Column", columns, key="area_x")
-        y_col = st.selectbox("Select Y Column", columns, key="area_y")
-        fig = px.area(df, x=x_col, y=y_col)
-        st.plotly_chart(fig)
-
-    elif chart_type == "Heatmap":
-        st.write("Heatmap requires two categorical columns and one numerical column.")
-        x_col = st.selectbox("Select X Column", columns, key="heatmap_x")
-        y_col = st.selectbox("Select Y Column", columns, key="heatmap_y")
-        z_col = st.selectbox("Select Z Column", columns, key="heatmap_z")
-        fig = px.density_heatmap(df, x=x_col, y=y_col, z=z_col)
-        st.plotly_chart(fig)
-
-    elif chart_type == "Tree Map":
-        path_col = st.selectbox("Select Path Column", columns, key="tree_path")
-        values_col = st.selectbox("Select Values Column", columns, key="tree_values")
-        fig = px.treemap(df, path=[path_col], values=values_col)
-        st.plotly_chart(fig)
-
-    elif chart_type == "Box Plot":
-        y_col = st.selectbox("Select Y Column", columns, key="box_y")
-        x_col = st.selectbox("Select X Column", columns, key="box_x")
-        fig = px.box(df, y=y_col, x=x_col)
-        st.plotly_chart(fig)
-
-    elif chart_type == "Violin Plot":
-        y_col = st.selectbox("Select Y Column", columns, key="violin_y")
-        x_col = st.selectbox("Select X Column", columns, key="violin_x")
-        fig = px.violin(df, y=y_col, x=x_col)
-        st.plotly_chart(fig)
-
-    elif chart_type == "Donut Chart":
-        names_col = st.selectbox("Select Names Column", columns, key="donut_names")
-        values_col = st.selectbox("Select Values Column", columns, key="donut_values")
-        fig = px.pie(df, names=names_col, values=values_col, hole=0.3)
-        st.plotly_chart(fig)
-
-    elif chart_type == "Waterfall Chart":
-        x_col = st.selectbox("Select X Column", columns, key="waterfall_x")
-        y_col = st.selectbox("Select Y Column", columns, key="waterfall_y")
-        fig = go.Figure(go.Waterfall(
-            x = df[x_col],
-            y = df[y_col]
-        ))
-        st.plotly_chart(fig)
-
-    elif chart_type == "Gantt Chart":
-        st.write("Gantt Chart requires columns for task names, start and end dates.")
-        task_col = st.selectbox("Select Task Column", columns, key="gantt_task")
-        start_col = st.selectbox("Select Start Date Column", columns, key="gantt_start")
-        end_col = st.selectbox("Select End Date Column", columns, key="gantt_end")
-        fig = px.timeline(df, x_start=start_col, x_end=end_col, y=task_col)
-        st.plotly_chart(fig)
-
-    elif chart_type == "Map Visualization":
-        st.write("Map Visualization requires columns for latitude and longitude.")
-        lat_col = st.selectbox("Select Latitude Column", columns, key="map_lat")
-        lon_col = st.selectbox("Select Longitude Column", columns, key="map_lon")
-        map_df = df[[lat_col, lon_col]].dropna()
-        map_center = [map_df[lat_col].mean(), map_df[lon_col].mean()]
-        m = folium.Map(location=map_center, zoom_start=2)
-        for idx, row in map_df.iterrows():
-            folium.Marker([row[lat_col], row[lon_col]]).add_to(m)
-        folium_static(m)
-
-    elif chart_type == "Sankey Diagram":
-        st.write("Sankey Diagram requires columns for source, target, and value.")
-        source_col = st.selectbox("Select Source Column", columns, key="sankey_source")
-        target_col = st.selectbox("Select Target Column", columns, key="sankey_target")
-        value_col = st.selectbox("Select Value Column", columns, key="sankey_value")
-        fig = go.Figure(go.Sankey(
-            node=dict(
-                pad=15,
-                thickness=20,
-                line=dict(color="black", width=0.5),
-                label=df[source_col].append(df[target_col]).unique()
-            ),
-            link=dict(
-                source=df[source_col].map({k: i for i, k in enumerate(df[source_col].append(df[target_col]).unique())}),
-                target=df[target_col].map({k: i for i, k in enumerate(df[source_col].append(df[target_col]).unique())}),
-                value=df[value_col]
-            )
-        ))
-        st.plotly_chart(fig)
-
-    elif chart_type == "Radar Chart":
-        st.write("Radar Chart requires multiple numerical columns.")
-        num_cols = st.multiselect("Select Numerical Columns", columns, key="radar_cols")
-        fig = go.Figure()
-        for col in num_cols:
-            fig.add_trace(go.Scatterpolar(r=df[col], theta=num_cols, fill='toself', name=col))
-        st.plotly_chart(fig)
-
-    elif chart_type == "Sunburst Chart":
-        st.write("Sunburst Chart requires hierarchical path columns and a value column.")
-        path_cols = st.multiselect("Select Path Columns", columns, key="sunburst_path")
-        values_col = st.selectbox("Select Values Column", columns, key="sunburst_values")
-        fig = px.sunburst(df, path=path_cols, values=values_col)
-        st.plotly_chart(fig)
-
-    elif chart_type == "Bullet Chart":
-        st.write("Bullet Chart requires columns for measure and target.")
-        measure_col = st.selectbox("Select Measure Column", columns, key="bullet_measure")
-        target_col = st.selectbox("Select Target Column", columns, key="bullet_target")
-        fig = go.Figure(go.Indicator(
-            mode="number+gauge+delta", value=df[measure_col].mean(),
-            delta={'reference': df[target_col].mean()},
-            gauge={'shape': "bullet"}))
-        st.plotly_chart(fig)
-
-    elif chart_type == "Bubble Map":
-        st.write("Bubble Map requires columns for latitude, longitude, and size.")
-        lat_col = st.selectbox("Select Latitude Column", columns, key="bubblemap_lat")
-        lon_col = st.selectbox("Select Longitude Column", columns, key="bubblemap_lon")
-        size_col = st.selectbox("Select Size Column", columns, key="bubblemap_size")
-        fig = px.scatter_geo(df, lat=lat_col, lon=lon_col, size=size_col)
-        st.plotly_chart(fig)
-
-    elif chart_type == "Network Diagram":
-        st.write("Network Diagram requires columns for source, target, and weight.")
-        source_col = st.selectbox("Select Source Column", columns, key="network_source")
-        target_col = st.selectbox("Select Target Column", columns, key="network_target")
-        weight_col = st.selectbox("Select Weight Column", columns, key="network_weight")
-        fig = go.Figure(go.Sankey(
-            node=dict(
-                pad=15,
-                thickness=20,
-                line=dict(color="black", width=0.5),
-                label=df[source_col].append(df[target_col]).unique()
-            ),
-            link=dict(
-                source=df[source_col].map({k: i for i, k in enumerate(df[source_col].append(df[target_col]).unique())}),
-                target=df[target_col].map({k: i for i, k in enumerate(df[source_col].append(df[target_col]).unique())}),
-                value=df[weight_col]
-            )
-        ))
-        st.plotly_chart(fig)
-
-    elif chart_type == "Chord Diagram":
-        st.write("Chord Diagram requires columns for source, target, and value.")
-        source_col = st.selectbox("Select Source Column", columns, key="chord_source")
-        target_col = st.selectbox("Select Target Column", columns, key="chord_target")
-        value_col = st.selectbox("Select Value Column", columns, key="chord_value")
-        fig = go.Figure(go.Chord(
-            df[source_col], df[target_col], df[value_col]
-        ))
-        st.plotly_chart(fig)
-
-    elif chart_type == "Timeline":
-        st.write("Timeline requires columns for events and dates.")
-        event_col = st.selectbox("Select Event Column", columns, key="timeline_event")
-        date_col = st.selectbox("Select Date Column", columns, key="timeline_date")
-        fig = px.timeline(df, x_start=date_col, x_end=date_col, y=event_col)
-        st.plotly_chart(fig)
-
-    elif chart_type == "Word Cloud":
-        st.write("Word Cloud requires a column for text data.")
-        text_col = st.selectbox("Select Text Column", columns, key="wordcloud_text")
-        text = " ".join(df[text_col].dropna().astype(str))
-        wordcloud = WordCloud().generate(text)
-        plt.imshow(wordcloud, interpolation='bilinear')
-        plt.axis("off")
-        st.pyplot()
+        display_dataframe_page(frame(), dataset_hash)
+
+    if st.checkbox("Show Column Profile"):
+        st.dataframe(cached_column_profile(frame(), dataset_hash), hide_index=True)
+
+    columns = live_source.columns if live_source is not None else df.columns.tolist()
+    chart = CHART_REGISTRY[chart_type]
+    if chart["note"]:
+        st.write(chart["note"])
+    params = {widget["param"]: draw_widget(widget, columns, f"{chart['key']}_{widget['param']}") for widget in chart["widgets"]}
+
+    # Term counts are cached separately so word cloud styling changes skip tokenization
+    if chart_type == "Word Cloud":
+        with span("prep", step="word frequencies"):
+            params["frequencies"] = cached_word_frequencies(frame(), dataset_hash, params["text"])
+
+    if live_source is not None:
+        build = lambda: build_live_chart(live_source, chart_type, params, render_options)
+    else:
+        build = lambda: build_chart(df, chart_type, params, render_options)
+    render_chart(build, chart_type, params, render_options, dataset_hash)
+
+# Tailing sources shared by every session watching the same path
+@st.cache_resource
+def get_live_source(path):
+    return LiveSource(path)
+
+# Custom function to read what was appended to a live source and redraw its chart; runs as an auto-refreshing fragment
+def live_dashboard(source, chart_type, render_options):
+    try:
+        with collect_spans() as spans:
+            with span("load") as load_span:
+                new_rows = source.poll()
+            load_span.update(source="live", rows=source.rows, new_rows=new_rows)
+            st.caption(f"{source.rows:,} rows from {len(source.offsets):,} file(s), {new_rows:,} new since the last refresh")
+            if source.text_fallbacks:
+                st.caption(f"Read as text because appended rows did not fit their first dtype: {', '.join(map(str, source.text_fallbacks))}")
+            generate_visualizations(None, chart_type, render_options, source.dataset_hash, live_source=source)
+        # Fragments cannot write to the sidebar, so the panel is drawn below the chart
+        if show_performance_panel:
+            display_performance_panel(spans, st)
+        write_perf_log(spans, session=st.session_state.setdefault("perf_session", uuid.uuid4().hex),
+                       run=uuid.uuid4().hex, timestamp=time.time(), dataset_hash=source.dataset_hash,
+                       chart_type=chart_type)
+    except Exception as e:
+        st.error(f"Error: {e}")
 
 # Streamlit App
 st.title("Advanced Data Visualization App")
@@ -406,22 +489,60 @@ st.sidebar.header("Chart Information")
 selected_chart_info = st.sidebar.selectbox("Select Chart Type", list(chart_details.keys()), key="chart_info")
 display_chart_info(selected_chart_info)
 
-# File uploader
-uploaded_file = st.file_uploader("Choose a file", type=["csv", "xlsx"], key="file_uploader")
-if uploaded_file is not None:
-    try:
-        with st.spinner('Loading data...'):
-            df = load_data(uploaded_file)
-        st.success('Data loaded successfully!')
-        
-        chart_type = st.selectbox("Select Chart Type", ["Bar Chart", "Line Chart", "Pie Chart", "Histogram", "Scatter Plot",
-                                                        "Bubble Chart", "Area Chart", "Heatmap", "Tree Map", "Box Plot", 
-                                                        "Violin Plot", "Donut Chart", "Waterfall Chart", "Gantt Chart", 
-                                                        "Map Visualization", "Sankey Diagram", "Radar Chart", "Sunburst Chart", 
-                                                        "Bullet Chart", "Bubble Map", "Network Diagram", "Chord Diagram", 
-                                                        "Timeline", "Word Cloud"], key="main_chart_type")
-        
-        generate_visualizations(df, chart_type)
-    
-    except Exception as e:
-        st.error(f"Error: {e}")
+# Sidebar rendering options
+st.sidebar.header("Rendering Options")
+render_options = {
+    "point_budget": st.sidebar.number_input("Point Budget", min_value=100, max_value=1_000_000, value=DEFAULT_POINT_BUDGET, step=1000, key="point_budget"),
+    "downsample_method": st.sidebar.selectbox("Series Downsampling", DOWNSAMPLE_METHODS, key="downsample_method"),
+    "distribution_mode": st.sidebar.selectbox("Distribution Charts", DISTRIBUTION_MODES, key="distribution_mode"),
+    "webgl_threshold": st.sidebar.number_input("WebGL Above N Points (0 keeps SVG)", min_value=0, value=DEFAULT_WEBGL_THRESHOLD, step=1000, key="webgl_threshold"),
+}
+
+show_performance_panel = st.sidebar.checkbox("Show Performance Panel", key="show_performance_panel")
+
+display_startup_timings()
+
+# Data source: an uploaded file, or a local file or directory that keeps growing
+st.sidebar.header("Data Source")
+data_source = st.sidebar.radio("Data Source", ["Upload File", "Live File or Directory"], key="data_source", label_visibility="collapsed")
+
+if data_source == "Live File or Directory":
+    live_path = st.sidebar.text_input("CSV File or Directory", key="live_path")
+    refresh_seconds = st.sidebar.number_input("Refresh Every (seconds)", min_value=1, value=DEFAULT_REFRESH_SECONDS, step=1, key="live_refresh")
+    if live_path:
+        chart_type = st.selectbox("Select Chart Type", CHART_TYPES, key="main_chart_type")
+        st.fragment(run_every=refresh_seconds)(live_dashboard)(get_live_source(live_path), chart_type, render_options)
+    else:
+        st.info("Enter the path of a CSV file, or of a directory of CSV files, that is being appended to.")
+else:
+    # File uploader
+    uploaded_file = st.file_uploader("Choose a file", type=["csv", "xlsx"], key="file_uploader")
+    if uploaded_file is not None:
+        try:
+            with collect_spans() as spans:
+                if uploaded_file.name.endswith(".xlsx"):
+                    excel_selection = choose_excel_selection(uploaded_file)
+                    if excel_selection is None:
+                        st.info("Choose a worksheet and the columns you need, then press Load Sheet.")
+                        st.stop()
+                    with span("load") as load_span:
+                        df, load_info = load_excel_data(uploaded_file, *excel_selection)
+                else:
+                    with st.spinner('Loading data...'), span("load") as load_span:
+                        df, load_info = load_data(uploaded_file)
+                load_span.update(source=load_info["source"], rows=load_info["rows"])
+                st.success('Data loaded successfully!')
+                display_load_stats(load_info)
+
+                chart_type = st.selectbox("Select Chart Type", CHART_TYPES, key="main_chart_type")
+
+                generate_visualizations(df, chart_type, render_options, load_info["dataset_hash"])
+            display_figure_cache_stats()
+            if show_performance_panel:
+                display_performance_panel(spans)
+            write_perf_log(spans, session=st.session_state.setdefault("perf_session", uuid.uuid4().hex),
+                           run=uuid.uuid4().hex, timestamp=time.time(), dataset_hash=load_info["dataset_hash"],
+                           chart_type=chart_type)
+
+        except Exception as e:
+            st.error(f"Error: {e}")
@@ -0,0 +1,230 @@
+"""Benchmark ingest and chart building across chart types and data sizes.
+
+Every (size, chart) measurement runs in a fresh process so peak RSS belongs to that measurement alone.
+Results are written as JSON; pass --compare with an earlier result file to print time ratios.
+
+Usage: python benchmark.py [--sizes 10000 100000 ...] [--charts "Line Chart" ...] [--output bench_results.json]
+"""
+import argparse
+import io
+import json
+import multiprocessing
+import os
+import platform
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from perf import peak_rss_bytes
+
+DEFAULT_SIZES = [10 ** 4, 10 ** 5, 10 ** 6, 10 ** 7]
+WARM_IMPORTS = ["plotly.express", "plotly.graph_objects", "folium", "folium.plugins",
+                "matplotlib.pyplot", "wordcloud", "word_freq"]
+WORDS = ("data revenue growth market customer product sales region quarter forecast "
+         "pipeline margin churn retention launch strategy budget target team report").split()
+
+# Column mapping used for each chart type against the synthetic dataset
+BENCH_PARAMS = {
+    "Bar Chart": {"x": "category", "y": "value2"},
+    "Line Chart": {"x": "date", "y": "value"},
+    "Pie Chart": {"names": "category", "values": "size"},
+    "Histogram": {"x": "value2"},
+    "Scatter Plot": {"x": "value", "y": "value2"},
+    "Bubble Chart": {"x": "value", "y": "value2", "size": "size"},
+    "Area Chart": {"x": "date", "y": "value"},
+    "Heatmap": {"x": "category", "y": "subcategory", "z": "value2"},
+    "Tree Map": {"path": "category", "values": "size"},
+    "Box Plot": {"y": "value2", "x": "category"},
+    "Violin Plot": {"y": "value2", "x": "category"},
+    "Donut Chart": {"names": "category", "values": "size"},
+    "Waterfall Chart": {"x": "category", "y": "value2"},
+    "Gantt Chart": {"task": "task", "start": "start", "end": "end"},
+    "Map Visualization": {"lat": "lat", "lon": "lon", "mode": "Auto"},
+    "Sankey Diagram": {"source": "source", "target": "target", "value": "weight", "top_k": 50, "min_weight": 0.0},
+    "Radar Chart": {"cols": ["value", "value2", "size"]},
+    "Sunburst Chart": {"path": ["category", "subcategory"], "values": "size"},
+    "Bullet Chart": {"measure": "value2", "target": "size"},
+    "Bubble Map": {"lat": "lat", "lon": "lon", "size": "size"},
+    "Network Diagram": {"source": "source", "target": "target", "weight": "weight", "top_k": 50, "min_weight": 0.0},
+    "Chord Diagram": {"source": "source", "target": "target", "value": "weight"},
+    "Timeline": {"event": "event", "date": "date"},
+    "Word Cloud": {"text": "text"},
+}
+
+
+# Synthetic dataset with columns shaped for every chart type
+def make_dataset(n_rows, seed=0):
+    rng = np.random.default_rng(seed)
+    start = pd.Timestamp("2020-01-01")
+    categories = np.array([f"Category {i}" for i in range(12)])
+    category_codes = rng.integers(0, len(categories), n_rows)
+    # Node popularity follows a power law, like real edge logs
+    nodes = np.array([f"Node {i}" for i in range(500)])
+    node_weights = 1.0 / np.arange(1, len(nodes) + 1)
+    node_weights /= node_weights.sum()
+    task_start = start + pd.to_timedelta(rng.integers(0, 365, n_rows), unit="D")
+    words = np.array(WORDS)
+
+    return pd.DataFrame({
+        "date": pd.date_range(start, periods=n_rows, freq="min"),
+        "value": rng.normal(size=n_rows).cumsum(),
+        "value2": rng.normal(100, 15, n_rows),
+        "size": rng.uniform(1, 100, n_rows),
+        "category": categories[category_codes],
+        "subcategory": np.char.add(categories[category_codes], np.char.add(" / ", rng.integers(0, 5, n_rows).astype(str))),
+        "task": np.char.add("Task ", (np.arange(n_rows) % 50).astype(str)),
+        "start": task_start,
+        "end": task_start + pd.to_timedelta(rng.integers(1, 60, n_rows), unit="D"),
+        "lat": np.clip(rng.normal(40, 8, n_rows), -90, 90),
+        "lon": np.clip(rng.normal(-95, 15, n_rows), -180, 180),
+        "source": nodes[rng.choice(len(nodes), n_rows, p=node_weights)],
+        "target": nodes[rng.choice(len(nodes), n_rows, p=node_weights)],
+        "weight": rng.exponential(10, n_rows),
+        "event": np.char.add("Event ", (np.arange(n_rows) % 100).astype(str)),
+        "text": [" ".join(row) for row in words[rng.integers(0, len(words), (n_rows, 8))]],
+    })
+
+
+# Serialized size of a figure as it would be shipped to the browser
+def payload_bytes(fig, renderer):
+    if renderer == "folium":
+        return len(fig.get_root().render().encode())
+    if renderer == "matplotlib":
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format="png")
+        return buffer.getbuffer().nbytes
+    return len(fig.to_json().encode())
+
+
+# Parse the CSV the way an upload is parsed and store it in the benchmark's Arrow cache
+def measure_ingest(csv_path, cache_dir, key):
+    from dataset_cache import store_cached_frame
+    from ingest import read_csv_optimized
+
+    record = {"stage": "ingest", "error": None}
+    with open(csv_path, "rb") as file:
+        df, stats = read_csv_optimized(file)
+    record.update(ingest_seconds=stats["seconds"], rows_per_second=stats["rows_per_second"],
+                  frame_bytes=stats["memory_bytes"], peak_rss_bytes=peak_rss_bytes())
+    store_cached_frame(key, df, cache_dir, max_bytes=float("inf"))
+    return record
+
+
+# Build one chart from the cached dataset and measure prep, figure build and payload size
+def measure_chart(chart_type, cache_dir, key, render_options):
+    from charts import CHART_REGISTRY, build_chart
+    from dataset_cache import load_cached_frame
+    from lazy_imports import lazy_import
+    from perf import collect_spans, span_seconds
+
+    record = {"stage": "chart", "chart": chart_type, "error": None}
+    # Import every renderer up front so cold import time is not counted as figure build time
+    for module in WARM_IMPORTS:
+        lazy_import(module)
+    df = load_cached_frame(key, cache_dir)
+    try:
+        with collect_spans() as spans:
+            fig, _ = build_chart(df, chart_type, BENCH_PARAMS[chart_type], render_options)
+        prep = span_seconds(spans, "prep")
+        record.update(prep_seconds=prep, figure_seconds=span_seconds(spans, "build") - prep)
+        record["payload_bytes"] = payload_bytes(fig, CHART_REGISTRY[chart_type]["renderer"])
+    except Exception as e:
+        record["error"] = f"{type(e).__name__}: {' '.join(str(e).split())}"
+    record["peak_rss_bytes"] = peak_rss_bytes()
+    return record
+
+
+# Run every measurement for one dataset size, each in its own process
+def run_size(n_rows, chart_types, render_options, work_dir, seed=0):
+    csv_path = os.path.join(work_dir, f"bench_{n_rows}.csv")
+    make_dataset(n_rows, seed).to_csv(csv_path, index=False)
+    key = f"bench-{n_rows}-{seed}"
+
+    records = []
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=1, mp_context=context, max_tasks_per_child=1) as executor:
+        records.append(executor.submit(measure_ingest, csv_path, work_dir, key).result())
+        for chart_type in chart_types:
+            records.append(executor.submit(measure_chart, chart_type, work_dir, key, render_options).result())
+    os.remove(csv_path)
+
+    for record in records:
+        record["rows"] = n_rows
+        print(format_record(record), flush=True)
+    return records
+
+
+def format_record(record):
+    name = record.get("chart", "ingest")
+    if record["error"]:
+        return f"{record['rows']:>10,} {name:<20} ERROR {record['error'][:80]}"
+    if record["stage"] == "ingest":
+        timing = f"ingest {record['ingest_seconds']:8.3f}s"
+    else:
+        timing = (f"prep {record['prep_seconds']:8.3f}s  figure {record['figure_seconds']:8.3f}s  "
+                  f"payload {record['payload_bytes'] / 1e6:9.2f} MB")
+    peak = record["peak_rss_bytes"]
+    peak = "n/a" if peak is None else f"{peak / 1e6:9.1f} MB"
+    return f"{record['rows']:>10,} {name:<20} {timing}  peak RSS {peak}"
+
+
+# Print how each timing changed against an earlier result file (>1 means slower now)
+def compare_results(current, previous):
+    def index(results):
+        return {(r["rows"], r.get("chart", "ingest")): r for r in results["records"]}
+
+    before = index(previous)
+    print(f"{'rows':>10} {'chart':<20} {'metric':<16} {'before':>10} {'after':>10} {'ratio':>7}")
+    for key, record in index(current).items():
+        old = before.get(key)
+        if old is None or record["error"] or old["error"]:
+            continue
+        for metric in ("ingest_seconds", "prep_seconds", "figure_seconds", "payload_bytes", "peak_rss_bytes"):
+            if record.get(metric) is not None and old.get(metric):
+                ratio = record[metric] / old[metric]
+                print(f"{key[0]:>10,} {key[1]:<20} {metric:<16} {old[metric]:>10.3g} {record[metric]:>10.3g} {ratio:>7.2f}")
+
+
+def main(argv=None):
+    from charts import CHART_TYPES, DEFAULT_RENDER_OPTIONS
+
+    parser = argparse.ArgumentParser(description="Benchmark ingest and chart building across data sizes.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Row counts to benchmark")
+    parser.add_argument("--charts", nargs="+", default=CHART_TYPES, help="Chart types to benchmark")
+    parser.add_argument("--output", default="bench_results.json", help="Where to write the JSON results")
+    parser.add_argument("--compare", help="Earlier JSON results to compare against")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    work_dir = tempfile.mkdtemp(prefix="datavis_bench_")
+    try:
+        records = []
+        for n_rows in args.sizes:
+            records.extend(run_size(n_rows, args.charts, DEFAULT_RENDER_OPTIONS, work_dir, args.seed))
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    results = {
+        "created": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "pandas": pd.__version__,
+        "render_options": DEFAULT_RENDER_OPTIONS,
+        "seed": args.seed,
+        "records": records,
+    }
+    with open(args.output, "w") as file:
+        json.dump(results, file, indent=2)
+    print(f"Wrote {len(records)} results to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as file:
+            compare_results(results, json.load(file))
+
+
+if __name__ == "__main__":
+    main()
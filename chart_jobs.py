@@ -0,0 +1,111 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from perf import collect_spans
+
+# Chart builds running at once across every session; further jobs wait in the pool's queue
+CHART_JOB_WORKERS = int(os.environ.get("DATAVIS_CHART_WORKERS", min(4, os.cpu_count() or 1)))
+# Rough share of a build done at each stage, for progress bars
+STAGE_PROGRESS = {"queued": 0.05, "building": 0.35, "serializing": 0.8, "done": 1.0}
+
+
+class JobCancelled(Exception):
+    pass
+
+
+# One chart spec being built in the background, and the slots currently waiting for it
+class ChartJob:
+    def __init__(self, key):
+        self.key = key
+        self.slots = set()
+        self.stage = "queued"
+        self.spans = []
+        self.cancel_event = threading.Event()
+        self.future = None
+
+    # Called by the job's work between stages; stops a job no slot is waiting for any more
+    def set_stage(self, stage):
+        if self.cancel_event.is_set():
+            raise JobCancelled(self.key)
+        self.stage = stage
+
+    def progress(self):
+        return STAGE_PROGRESS.get(self.stage, 0.0)
+
+    def done(self):
+        return self.future.done()
+
+    def result(self, timeout=None):
+        return self.future.result(timeout)
+
+
+# Bounded thread pool for chart builds. A slot (one chart position in one session) waits on at most
+# one job: submitting a new spec for a slot cancels the job it replaces unless another slot still
+# waits on it, and slots asking for a spec that is already being built share that job.
+# Threads rather than processes, so jobs read the session's frames without copying them.
+class ChartJobs:
+    def __init__(self, max_workers=CHART_JOB_WORKERS):
+        self.executor = ThreadPoolExecutor(max_workers=max(int(max_workers), 1), thread_name_prefix="chart-job")
+        self.jobs = {}
+        self.slots = {}
+        self.submitted = 0
+        self.shared = 0
+        self.cancelled = 0
+        # Re-entrant because a job that finishes at once runs its done callback inside submit
+        self.lock = threading.RLock()
+
+    # Job building `key` for `slot`; `work(job)` runs on the pool and returns the job's result
+    def submit(self, slot, key, work):
+        with self.lock:
+            previous = self.slots.get(slot)
+            if previous is not None and previous.key != key:
+                self._release(previous, slot)
+            job = self.jobs.get(key)
+            if job is None:
+                job = self.jobs[key] = ChartJob(key)
+                self.submitted += 1
+                job.future = self.executor.submit(self._run, job, work)
+                job.future.add_done_callback(lambda _: self._finished(job))
+            elif slot not in job.slots:
+                self.shared += 1
+            job.slots.add(slot)
+            self.slots[slot] = job
+            return job
+
+    def _release(self, job, slot):
+        job.slots.discard(slot)
+        if job.slots or job.done():
+            return
+        # A queued job never starts; a running one stops at its next stage
+        job.cancel_event.set()
+        job.future.cancel()
+        self.cancelled += 1
+        if self.jobs.get(job.key) is job:
+            del self.jobs[job.key]
+
+    @staticmethod
+    def _run(job, work):
+        with collect_spans() as spans:
+            job.spans = spans
+            job.set_stage("building")
+            result = work(job)
+        job.stage = "done"
+        return result
+
+    def _finished(self, job):
+        with self.lock:
+            if self.jobs.get(job.key) is job:
+                del self.jobs[job.key]
+            for slot in job.slots:
+                if self.slots.get(slot) is job:
+                    del self.slots[slot]
+
+    def stats(self):
+        with self.lock:
+            return {
+                "active": len(self.jobs),
+                "submitted": self.submitted,
+                "shared": self.shared,
+                "cancelled": self.cancelled,
+            }
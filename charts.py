@@ -0,0 +1,497 @@
+import numpy as np
+from pandas.api.types import is_numeric_dtype
+
+from downsampling import DEFAULT_POINT_BUDGET, downsample_series, downsample_points
+from graph_prep import prepare_graph
+from incremental import GroupSum, StreamingHistogram, StreamingMinMax, is_axis_dtype
+from lazy_imports import lazy_import
+from map_binning import MAP_MODES, resolve_map_mode, aggregate_geohash_bins
+from perf import span
+from preaggregate import MAX_AUTO_BINS, should_preaggregate, histogram_bins, heatmap_grid, box_summaries, kde_curves
+from trace_encoding import DEFAULT_WEBGL_THRESHOLD, render_mode, encode_date_arrays
+
+DEFAULT_RENDER_OPTIONS = {
+    "point_budget": DEFAULT_POINT_BUDGET,
+    "downsample_method": "LTTB",
+    "distribution_mode": "Auto",
+    "webgl_threshold": DEFAULT_WEBGL_THRESHOLD,
+}
+
+# Chart type -> builder, the widgets that collect its parameters and the renderer for its figure
+CHART_REGISTRY = {}
+
+
+# Widget specs; "column" and "columns" widgets are offered the dataset's columns as options
+def column(param, label):
+    return {"param": param, "label": label, "kind": "column"}
+
+
+def columns(param, label):
+    return {"param": param, "label": label, "kind": "columns"}
+
+
+def choice(param, label, options):
+    return {"param": param, "label": label, "kind": "choice", "options": options}
+
+
+def number(param, label, **kwargs):
+    return {"param": param, "label": label, "kind": "number", "kwargs": kwargs}
+
+
+def slider(param, label, **kwargs):
+    return {"param": param, "label": label, "kind": "slider", "kwargs": kwargs}
+
+
+# Register a builder(df, params, render_options) -> (figure, caption) under a chart type.
+# `key` prefixes the widget keys; `renderer` is "plotly", "folium" or "matplotlib".
+def register_chart(chart_type, key, widgets, renderer="plotly", note=None):
+    def decorator(build):
+        CHART_REGISTRY[chart_type] = {
+            "build": build,
+            "key": key,
+            "widgets": widgets,
+            "renderer": renderer,
+            "note": note,
+            "live": None,
+        }
+        return build
+    return decorator
+
+
+# Register a builder(source, params, render_options) -> (figure, caption) that draws an already registered
+# chart type from a LiveSource's incrementally updated aggregates instead of its whole frame
+def live_chart(chart_type):
+    def decorator(build):
+        CHART_REGISTRY[chart_type]["live"] = build
+        return build
+    return decorator
+
+
+# Custom function to describe how many points made it into the figure
+def point_count_caption(rendered, total):
+    return f"{rendered:,} of {total:,} points rendered"
+
+
+# Custom function to describe what a pre-aggregated chart was computed from
+def summary_caption(rows, summary):
+    return f"{rows:,} rows summarized into {summary}"
+
+
+# Custom function to draw precomputed bin counts as a histogram
+def histogram_figure(hist, x_label):
+    go = lazy_import("plotly.graph_objects")
+    if "categories" in hist:
+        fig = go.Figure(go.Bar(x=hist["categories"], y=hist["counts"]))
+        fig.update_layout(xaxis_title=x_label, yaxis_title="count")
+        return fig
+    edges = hist["edges"]
+    centers = (edges[:-1] + edges[1:]) / 2
+    start, end, size = edges[0], edges[-1], edges[1] - edges[0]
+    if hist.get("datetime"):
+        # Datetime edges are nanoseconds; date axes take bin sizes in milliseconds
+        centers = centers.round().astype("int64").astype("datetime64[ns]")
+        start, end = (str(np.datetime64(int(edge), "ns")) for edge in (start, end))
+        size /= 1e6
+    # histfunc="sum" over one precomputed count per bin reproduces the client-side histogram
+    fig = go.Figure(go.Histogram(
+        x=centers, y=hist["counts"], histfunc="sum", xbins=dict(start=start, end=end, size=size),
+    ))
+    fig.update_layout(xaxis_title=x_label, yaxis_title="count")
+    if hist.get("datetime"):
+        fig.update_xaxes(type="date")
+    return fig
+
+
+# Custom function to draw a prepared graph as a Sankey diagram
+def build_flow_figure(graph):
+    go = lazy_import("plotly.graph_objects")
+    return go.Figure(go.Sankey(
+        node=dict(
+            pad=15,
+            thickness=20,
+            line=dict(color="black", width=0.5),
+            label=graph["labels"]
+        ),
+        link=dict(
+            source=graph["source"],
+            target=graph["target"],
+            value=graph["value"]
+        )
+    ))
+
+
+# Custom function to describe how much a graph was reduced
+def graph_caption(graph):
+    return f"{graph['rows']:,} rows aggregated into {len(graph['value']):,} links between {len(graph['labels']):,} nodes"
+
+
+@register_chart("Bar Chart", "bar", [column("x", "Select X Column"), column("y", "Select Y Column")])
+def build_bar(df, params, render_options):
+    px = lazy_import("plotly.express")
+    return px.bar(df, x=params["x"], y=params["y"]), None
+
+
+@register_chart("Line Chart", "line", [column("x", "Select X Column"), column("y", "Select Y Column")])
+def build_line(df, params, render_options):
+    px = lazy_import("plotly.express")
+    with span("prep"):
+        plot_df, total = downsample_series(df, params["x"], params["y"], render_options["point_budget"], render_options["downsample_method"])
+    fig = px.line(plot_df, x=params["x"], y=params["y"], render_mode=render_mode(len(plot_df), render_options["webgl_threshold"]))
+    return encode_date_arrays(fig), point_count_caption(len(plot_df), total)
+
+
+@register_chart("Pie Chart", "pie", [column("names", "Select Names Column"), column("values", "Select Values Column")])
+def build_pie(df, params, render_options):
+    px = lazy_import("plotly.express")
+    return px.pie(df, names=params["names"], values=params["values"]), None
+
+
+@register_chart("Histogram", "hist", [column("x", "Select X Column"),
+                                      number("bins", "Number of Bins (0 picks automatically)", min_value=0, value=0, step=10)])
+def build_histogram(df, params, render_options):
+    if should_preaggregate(render_options["distribution_mode"], len(df)):
+        with span("prep"):
+            hist = histogram_bins(df[params["x"]], params.get("bins", 0))
+        return histogram_figure(hist, params["x"]), summary_caption(hist["rows"], f"{len(hist['counts']):,} {'bars' if 'categories' in hist else 'bins'}")
+    px = lazy_import("plotly.express")
+    return px.histogram(df, x=params["x"], nbins=params.get("bins") or None), None
+
+
+@register_chart("Scatter Plot", "scatter", [column("x", "Select X Column"), column("y", "Select Y Column")])
+def build_scatter(df, params, render_options):
+    px = lazy_import("plotly.express")
+    with span("prep"):
+        plot_df, total = downsample_points(df, params["x"], params["y"], render_options["point_budget"])
+    fig = px.scatter(plot_df, x=params["x"], y=params["y"], render_mode=render_mode(len(plot_df), render_options["webgl_threshold"]))
+    return encode_date_arrays(fig), point_count_caption(len(plot_df), total)
+
+
+@register_chart("Bubble Chart", "bubble", [column("x", "Select X Column"), column("y", "Select Y Column"),
+                                           column("size", "Select Size Column")])
+def build_bubble(df, params, render_options):
+    px = lazy_import("plotly.express")
+    with span("prep"):
+        plot_df, total = downsample_points(df, params["x"], params["y"], render_options["point_budget"])
+    fig = px.scatter(plot_df, x=params["x"], y=params["y"], size=params["size"],
+                     render_mode=render_mode(len(plot_df), render_options["webgl_threshold"]))
+    return encode_date_arrays(fig), point_count_caption(len(plot_df), total)
+
+
+@register_chart("Area Chart", "area", [column("x", "Select X Column"), column("y", "Select Y Column")])
+def build_area(df, params, render_options):
+    px = lazy_import("plotly.express")
+    with span("prep"):
+        plot_df, total = downsample_series(df, params["x"], params["y"], render_options["point_budget"], render_options["downsample_method"])
+    # Filled areas have no WebGL trace type, but their dates can still travel as typed arrays
+    fig = px.area(plot_df, x=params["x"], y=params["y"])
+    return encode_date_arrays(fig), point_count_caption(len(plot_df), total)
+
+
+@register_chart("Heatmap", "heatmap", [column("x", "Select X Column"), column("y", "Select Y Column"),
+                                       column("z", "Select Z Column")],
+                note="Heatmap requires two categorical columns and one numerical column.")
+def build_heatmap(df, params, render_options):
+    if should_preaggregate(render_options["distribution_mode"], len(df)):
+        go = lazy_import("plotly.graph_objects")
+        with span("prep"):
+            grid = heatmap_grid(df, params["x"], params["y"], params["z"])
+        fig = go.Figure(go.Heatmap(x=grid["x"], y=grid["y"], z=grid["z"], colorbar=dict(title=f"sum of {params['z']}")))
+        fig.update_layout(xaxis_title=params["x"], yaxis_title=params["y"])
+        return fig, summary_caption(grid["rows"], f"{grid['z'].size:,} cells")
+    px = lazy_import("plotly.express")
+    return px.density_heatmap(df, x=params["x"], y=params["y"], z=params["z"]), None
+
+
+@register_chart("Tree Map", "tree", [column("path", "Select Path Column"), column("values", "Select Values Column")])
+def build_tree_map(df, params, render_options):
+    px = lazy_import("plotly.express")
+    return px.treemap(df, path=[params["path"]], values=params["values"]), None
+
+
+@register_chart("Box Plot", "box", [column("y", "Select Y Column"), column("x", "Select X Column")])
+def build_box(df, params, render_options):
+    if should_preaggregate(render_options["distribution_mode"], len(df)):
+        go = lazy_import("plotly.graph_objects")
+        with span("prep"):
+            summary = box_summaries(df, params["y"], params["x"])
+        groups = summary["groups"]
+        names = [str(g["name"]) for g in groups]
+        fig = go.Figure(go.Box(
+            x=names, q1=[g["q1"] for g in groups], median=[g["median"] for g in groups],
+            q3=[g["q3"] for g in groups], mean=[g["mean"] for g in groups],
+            lowerfence=[g["lowerfence"] for g in groups], upperfence=[g["upperfence"] for g in groups],
+            name=params["y"], showlegend=False,
+        ))
+        # Precomputed boxes cannot carry points, so sampled outliers ride along as a marker trace
+        fig.add_trace(go.Scatter(
+            x=[name for name, g in zip(names, groups) for _ in g["outliers"]],
+            y=np.concatenate([g["outliers"] for g in groups]) if groups else [],
+            mode="markers", name="outliers (sampled)", showlegend=False,
+        ))
+        fig.update_layout(xaxis_title=params["x"], yaxis_title=params["y"])
+        return fig, summary_caption(summary["rows"], f"{len(groups):,} five-number summaries")
+    px = lazy_import("plotly.express")
+    return px.box(df, y=params["y"], x=params["x"]), None
+
+
+@register_chart("Violin Plot", "violin", [column("y", "Select Y Column"), column("x", "Select X Column")])
+def build_violin(df, params, render_options):
+    if should_preaggregate(render_options["distribution_mode"], len(df)):
+        go = lazy_import("plotly.graph_objects")
+        with span("prep"):
+            kde = kde_curves(df, params["y"], params["x"])
+        groups = kde["groups"]
+        # go.Violin always estimates its KDE in the browser, so server-side curves are drawn as mirrored filled outlines
+        fig = go.Figure()
+        for position, g in enumerate(groups):
+            half = 0.4 * g["density"] / g["density"].max()
+            fig.add_trace(go.Scatter(
+                x=np.concatenate([position - half, (position + half)[::-1]]),
+                y=np.concatenate([g["grid"], g["grid"][::-1]]),
+                fill="toself", mode="lines", name=str(g["name"]), showlegend=False,
+            ))
+            fig.add_trace(go.Scatter(
+                x=[position, position], y=[g["q1"], g["q3"]], mode="lines+markers",
+                line=dict(color="black", width=4), marker=dict(size=[1, 1]), showlegend=False, hoverinfo="y",
+            ))
+            fig.add_trace(go.Scatter(
+                x=[position], y=[g["median"]], mode="markers", marker=dict(color="white", size=7),
+                showlegend=False, hovertemplate="median: %{y}<extra></extra>",
+            ))
+        fig.update_layout(
+            xaxis=dict(title=params["x"], tickvals=list(range(len(groups))), ticktext=[str(g["name"]) for g in groups]),
+            yaxis_title=params["y"],
+        )
+        return fig, summary_caption(kde["rows"], f"{len(groups):,} KDE curves")
+    px = lazy_import("plotly.express")
+    return px.violin(df, y=params["y"], x=params["x"]), None
+
+
+@register_chart("Donut Chart", "donut", [column("names", "Select Names Column"), column("values", "Select Values Column")])
+def build_donut(df, params, render_options):
+    px = lazy_import("plotly.express")
+    return px.pie(df, names=params["names"], values=params["values"], hole=0.3), None
+
+
+@register_chart("Waterfall Chart", "waterfall", [column("x", "Select X Column"), column("y", "Select Y Column")])
+def build_waterfall(df, params, render_options):
+    go = lazy_import("plotly.graph_objects")
+    fig = go.Figure(go.Waterfall(
+        x = df[params["x"]],
+        y = df[params["y"]]
+    ))
+    return fig, None
+
+
+@register_chart("Gantt Chart", "gantt", [column("task", "Select Task Column"), column("start", "Select Start Date Column"),
+                                         column("end", "Select End Date Column")],
+                note="Gantt Chart requires columns for task names, start and end dates.")
+def build_gantt(df, params, render_options):
+    px = lazy_import("plotly.express")
+    return px.timeline(df, x_start=params["start"], x_end=params["end"], y=params["task"]), None
+
+
+@register_chart("Map Visualization", "map", [column("lat", "Select Latitude Column"), column("lon", "Select Longitude Column"),
+                                             choice("mode", "Select Map Mode", MAP_MODES)],
+                renderer="folium", note="Map Visualization requires columns for latitude and longitude.")
+def build_map(df, params, render_options):
+    folium = lazy_import("folium")
+    plugins = lazy_import("folium.plugins")
+    lat_col, lon_col = params["lat"], params["lon"]
+    with span("prep"):
+        # Select the columns one at a time so the same column can serve as latitude and longitude
+        lats = df[lat_col].to_numpy(dtype="float64", na_value=np.nan)
+        lons = df[lon_col].to_numpy(dtype="float64", na_value=np.nan)
+        valid = ~(np.isnan(lats) | np.isnan(lons))
+        lats, lons = lats[valid], lons[valid]
+        map_mode = resolve_map_mode(params.get("mode", "Auto"), len(lats))
+        if map_mode == "Heatmap":
+            bins = aggregate_geohash_bins(lats, lons)
+    map_center = [lats.mean(), lons.mean()]
+    m = folium.Map(location=map_center, zoom_start=2)
+    caption = None
+    if map_mode == "Markers":
+        for lat, lon in zip(lats, lons):
+            folium.Marker([lat, lon]).add_to(m)
+    elif map_mode == "Clusters":
+        plugins.FastMarkerCluster(np.column_stack([lats, lons]).tolist()).add_to(m)
+    else:
+        plugins.HeatMap(bins[["lat", "lon", "count"]].to_numpy().tolist()).add_to(m)
+        caption = f"{len(lats):,} points aggregated into {len(bins):,} geohash bins"
+    return m, caption
+
+
+@register_chart("Sankey Diagram", "sankey", [column("source", "Select Source Column"), column("target", "Select Target Column"),
+                                             column("value", "Select Value Column"),
+                                             number("top_k", "Keep Top Nodes (0 keeps all)", min_value=0, value=50, step=10),
+                                             number("min_weight", "Minimum Node Weight", min_value=0.0, value=0.0)],
+                note="Sankey Diagram requires columns for source, target, and value.")
+def build_sankey(df, params, render_options):
+    with span("prep"):
+        graph = prepare_graph(df, params["source"], params["target"], params["value"],
+                              params.get("top_k", 0), params.get("min_weight", 0.0))
+    return build_flow_figure(graph), graph_caption(graph)
+
+
+@register_chart("Radar Chart", "radar", [columns("cols", "Select Numerical Columns")],
+                note="Radar Chart requires multiple numerical columns.")
+def build_radar(df, params, render_options):
+    go = lazy_import("plotly.graph_objects")
+    fig = go.Figure()
+    for col in params["cols"]:
+        fig.add_trace(go.Scatterpolar(r=df[col], theta=params["cols"], fill='toself', name=col))
+    return fig, None
+
+
+@register_chart("Sunburst Chart", "sunburst", [columns("path", "Select Path Columns"), column("values", "Select Values Column")],
+                note="Sunburst Chart requires hierarchical path columns and a value column.")
+def build_sunburst(df, params, render_options):
+    px = lazy_import("plotly.express")
+    return px.sunburst(df, path=list(params["path"]), values=params["values"]), None
+
+
+@register_chart("Bullet Chart", "bullet", [column("measure", "Select Measure Column"), column("target", "Select Target Column")],
+                note="Bullet Chart requires columns for measure and target.")
+def build_bullet(df, params, render_options):
+    go = lazy_import("plotly.graph_objects")
+    fig = go.Figure(go.Indicator(
+        mode="number+gauge+delta", value=df[params["measure"]].mean(),
+        delta={'reference': df[params["target"]].mean()},
+        gauge={'shape': "bullet"}))
+    return fig, None
+
+
+@register_chart("Bubble Map", "bubblemap", [column("lat", "Select Latitude Column"), column("lon", "Select Longitude Column"),
+                                            column("size", "Select Size Column")],
+                note="Bubble Map requires columns for latitude, longitude, and size.")
+def build_bubble_map(df, params, render_options):
+    px = lazy_import("plotly.express")
+    return px.scatter_geo(df, lat=params["lat"], lon=params["lon"], size=params["size"]), None
+
+
+@register_chart("Network Diagram", "network", [column("source", "Select Source Column"), column("target", "Select Target Column"),
+                                               column("weight", "Select Weight Column"),
+                                               number("top_k", "Keep Top Nodes (0 keeps all)", min_value=0, value=50, step=10),
+                                               number("min_weight", "Minimum Node Weight", min_value=0.0, value=0.0)],
+                note="Network Diagram requires columns for source, target, and weight.")
+def build_network(df, params, render_options):
+    with span("prep"):
+        graph = prepare_graph(df, params["source"], params["target"], params["weight"],
+                              params.get("top_k", 0), params.get("min_weight", 0.0))
+    return build_flow_figure(graph), graph_caption(graph)
+
+
+@register_chart("Chord Diagram", "chord", [column("source", "Select Source Column"), column("target", "Select Target Column"),
+                                           column("value", "Select Value Column")],
+                note="Chord Diagram requires columns for source, target, and value.")
+def build_chord(df, params, render_options):
+    go = lazy_import("plotly.graph_objects")
+    fig = go.Figure(go.Chord(
+        df[params["source"]], df[params["target"]], df[params["value"]]
+    ))
+    return fig, None
+
+
+@register_chart("Timeline", "timeline", [column("event", "Select Event Column"), column("date", "Select Date Column")],
+                note="Timeline requires columns for events and dates.")
+def build_timeline(df, params, render_options):
+    px = lazy_import("plotly.express")
+    return px.timeline(df, x_start=params["date"], x_end=params["date"], y=params["event"]), None
+
+
+@register_chart("Word Cloud", "wordcloud", [column("text", "Select Text Column"),
+                                            slider("max_words", "Maximum Words", min_value=10, max_value=500, value=200),
+                                            choice("colormap", "Select Color Map", ["viridis", "plasma", "inferno", "magma", "cividis"]),
+                                            choice("background", "Select Background Color", ["black", "white"])],
+                renderer="matplotlib", note="Word Cloud requires a column for text data.")
+def build_word_cloud(df, params, render_options):
+    plt = lazy_import("matplotlib.pyplot")
+    wordcloud = lazy_import("wordcloud")
+    frequencies = params.get("frequencies")
+    if frequencies is None:
+        with span("prep"):
+            frequencies = lazy_import("word_freq").word_frequencies(df[params["text"]])
+    cloud = wordcloud.WordCloud(
+        max_words=params.get("max_words", 200),
+        colormap=params.get("colormap", "viridis"),
+        background_color=params.get("background", "black"),
+    ).generate_from_frequencies(frequencies)
+    fig, ax = plt.subplots()
+    ax.imshow(cloud, interpolation='bilinear')
+    ax.axis("off")
+    return fig, None
+
+
+@live_chart("Bar Chart")
+def build_live_bar(source, params, render_options):
+    # A column used as both axes has no separate key to sum over
+    if params["x"] == params["y"]:
+        return build_bar(source.frame(), params, render_options)
+    with span("prep"):
+        totals = source.aggregate(("sum", (params["x"],), params["y"]), lambda: GroupSum([params["x"]], params["y"]))
+    fig, _ = build_bar(totals["frame"], params, render_options)
+    return fig, summary_caption(totals["rows"], f"{len(totals['frame']):,} bars")
+
+
+@live_chart("Line Chart")
+def build_live_line(source, params, render_options):
+    # Text x columns have no order to bucket on, so they are drawn from the whole frame, as is a source
+    # without rows yet, whose dtypes are unknown
+    dtypes = source.dtypes
+    if not all(col in dtypes and is_axis_dtype(dtypes[col]) for col in (params["x"], params["y"])):
+        return build_line(source.frame(), params, render_options)
+    px = lazy_import("plotly.express")
+    with span("prep"):
+        series = source.aggregate(("minmax", params["x"], params["y"], render_options["point_budget"]),
+                                  lambda: StreamingMinMax(params["x"], params["y"], render_options["point_budget"]))
+    plot_df = series["frame"]
+    fig = px.line(plot_df, x=params["x"], y=params["y"], render_mode=render_mode(len(plot_df), render_options["webgl_threshold"]))
+    return encode_date_arrays(fig), point_count_caption(len(plot_df), series["rows"])
+
+
+@live_chart("Histogram")
+def build_live_histogram(source, params, render_options):
+    dtypes = source.dtypes
+    if params["x"] not in dtypes or not is_numeric_dtype(dtypes[params["x"]]):
+        return build_histogram(source.frame(), params, render_options)
+    max_bins = params.get("bins") or MAX_AUTO_BINS
+    with span("prep"):
+        hist = source.aggregate(("hist", params["x"], max_bins), lambda: StreamingHistogram(params["x"], max_bins))
+    return histogram_figure(hist, params["x"]), summary_caption(hist["rows"], f"{len(hist['counts']):,} bins")
+
+
+@live_chart("Sankey Diagram")
+def build_live_sankey(source, params, render_options):
+    if len({params["source"], params["target"], params["value"]}) < 3:
+        return build_sankey(source.frame(), params, render_options)
+    with span("prep"):
+        edges = source.aggregate(("sum", (params["source"], params["target"]), params["value"]),
+                                 lambda: GroupSum([params["source"], params["target"]], params["value"]))
+        graph = prepare_graph(edges["frame"], params["source"], params["target"], params["value"],
+                              params.get("top_k", 0), params.get("min_weight", 0.0))
+    graph["rows"] = edges["rows"]
+    return build_flow_figure(graph), graph_caption(graph)
+
+
+CHART_TYPES = list(CHART_REGISTRY)
+
+
+# Build one chart from its column mapping; returns (figure, caption).
+# The "build" span covers the whole builder, "prep" spans inside it cover pandas/NumPy preparation.
+def build_chart(df, chart_type, params, render_options=DEFAULT_RENDER_OPTIONS):
+    chart = CHART_REGISTRY.get(chart_type)
+    if chart is None:
+        raise ValueError(f"Unknown chart type: {chart_type}")
+    with span("build"):
+        return chart["build"](df, params, render_options)
+
+
+# Build one chart from a LiveSource, through its live builder when it has one and from the whole frame otherwise
+def build_live_chart(source, chart_type, params, render_options=DEFAULT_RENDER_OPTIONS):
+    chart = CHART_REGISTRY.get(chart_type)
+    if chart is None:
+        raise ValueError(f"Unknown chart type: {chart_type}")
+    if chart["live"] is None:
+        return build_chart(source.frame(), chart_type, params, render_options)
+    with span("build"):
+        return chart["live"](source, params, render_options)
@@ -0,0 +1,116 @@
+import hashlib
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+
+import pyarrow as pa
+
+CACHE_DIR = os.environ.get("DATAVIS_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "datavis"))
+CACHE_MAX_BYTES = int(os.environ.get("DATAVIS_CACHE_MAX_BYTES", 2 * 1024 ** 3))
+# Bump when the ingest pipeline changes so stale parses are not reused
+CACHE_VERSION = "2"
+HASH_BLOCK_BYTES = 1024 * 1024
+# Loaded frames kept in process by FrameMemory; each stays shared, never copied
+MEMORY_MAX_FRAMES = int(os.environ.get("DATAVIS_MEMORY_FRAMES", 4))
+
+
+# Content hash of an uploaded file; the parse settings are part of the key
+def content_hash(file, *extra):
+    digest = hashlib.sha256(CACHE_VERSION.encode())
+    for part in extra:
+        digest.update(str(part).encode())
+    file.seek(0)
+    for block in iter(lambda: file.read(HASH_BLOCK_BYTES), b""):
+        digest.update(block)
+    file.seek(0)
+    return digest.hexdigest()
+
+
+def _cache_path(key, cache_dir):
+    return os.path.join(cache_dir, f"{key}.arrow")
+
+
+# Memory-map a cached Arrow file and return it as a DataFrame, or None on a miss
+def load_cached_frame(key, cache_dir=CACHE_DIR):
+    path = _cache_path(key, cache_dir)
+    try:
+        with pa.memory_map(path, "r") as source:
+            table = pa.ipc.open_file(source).read_all()
+        # Touch the file so eviction treats it as recently used
+        os.utime(path)
+    except (FileNotFoundError, pa.ArrowInvalid):
+        return None
+    return table.to_pandas(split_blocks=True)
+
+
+# Write a frame to the cache atomically so concurrent workers never see partial files. Returns whether the
+# frame was stored: caching is best effort, so a frame Arrow cannot hold (such as a column mixing numbers
+# and text) or a failed write leaves it uncached instead of failing the load.
+def store_cached_frame(key, df, cache_dir=CACHE_DIR, max_bytes=CACHE_MAX_BYTES):
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+        return False
+    tmp_path = None
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+        with os.fdopen(fd, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+        os.replace(tmp_path, _cache_path(key, cache_dir))
+    except BaseException as exc:
+        if tmp_path is not None and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        # A full or read-only cache directory only costs the next load a parse
+        if isinstance(exc, OSError):
+            return False
+        raise
+    evict_cache(cache_dir, max_bytes)
+    return True
+
+
+# Delete least recently used cache files until the directory fits in `max_bytes`
+def evict_cache(cache_dir=CACHE_DIR, max_bytes=CACHE_MAX_BYTES):
+    entries = []
+    for entry in os.scandir(cache_dir):
+        if entry.name.endswith(".arrow"):
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        total -= size
+
+
+# Frames already loaded in this process, keyed by dataset hash and shared by every session. Reruns take
+# the frame from here instead of re-reading its Arrow file; the least recently used are dropped beyond
+# `max_entries`.
+class FrameMemory:
+    def __init__(self, max_entries=MEMORY_MAX_FRAMES):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+            return entry
+
+    def put(self, key, entry):
+        with self.lock:
+            self.entries[key] = entry
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
@@ -0,0 +1,155 @@
+import numpy as np
+import pandas as pd
+
+DOWNSAMPLE_METHODS = ["LTTB", "Min/Max (M4)", "None"]
+DEFAULT_POINT_BUDGET = 5000
+
+
+# Convert a column to float64 values usable for bucketing (datetimes become epoch nanoseconds)
+def _numeric_values(series):
+    if pd.api.types.is_datetime64_any_dtype(series):
+        values = series.to_numpy(dtype="datetime64[ns]").astype("int64").astype("float64")
+        values[series.isna().to_numpy()] = np.nan
+        return values
+    if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+        return series.to_numpy(dtype="float64", na_value=np.nan)
+    return None
+
+
+# Largest-Triangle-Three-Buckets: keeps the points that preserve the visual shape of a series
+def lttb_indices(x, y, n_out):
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], max(edges[i + 1], edges[i] + 1)
+        next_start, next_end = edges[i + 1], edges[i + 2] if i + 2 < len(edges) else n
+        next_end = max(next_end, next_start + 1)
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+
+        areas = np.abs(
+            (x[a] - avg_x) * (y[start:end] - y[a])
+            - (x[a] - x[start:end]) * (avg_y - y[a])
+        )
+        a = start + int(np.argmax(areas))
+        selected[i + 1] = a
+
+    return np.unique(selected)
+
+
+# M4 bucketing: keeps first, last, min and max of every bucket so peaks are never lost
+def minmax_indices(x, y, n_out):
+    n = len(x)
+    n_buckets = max(n_out // 4, 1)
+    if n_out >= n:
+        return np.arange(n)
+
+    if x[-1] > x[0]:
+        buckets = ((x - x[0]) / (x[-1] - x[0]) * n_buckets).astype(np.int64)
+    else:
+        buckets = np.arange(n) * n_buckets // n
+    buckets = np.clip(buckets, 0, n_buckets - 1)
+
+    positions = pd.Series(np.arange(n))
+    grouped = pd.Series(y).groupby(buckets)
+    keep = np.concatenate([
+        positions.groupby(buckets).first().to_numpy(),
+        positions.groupby(buckets).last().to_numpy(),
+        grouped.idxmin().to_numpy(),
+        grouped.idxmax().to_numpy(),
+    ])
+    return np.unique(keep)
+
+
+# Grid-based sampling: caps points per cell so dense clusters thin out while sparse regions and outliers survive
+def density_sample_indices(x, y, n_out, grid_size=128, seed=0):
+    n = len(x)
+    if n_out >= n:
+        return np.arange(n)
+
+    def to_cells(values):
+        lo, hi = np.nanmin(values), np.nanmax(values)
+        if hi <= lo:
+            return np.zeros(len(values), dtype=np.int64)
+        return np.clip(((values - lo) / (hi - lo) * grid_size).astype(np.int64), 0, grid_size - 1)
+
+    # Coarsen the grid until every occupied cell can keep at least one point
+    while True:
+        cells = to_cells(x) * grid_size + to_cells(y)
+        counts = np.bincount(cells)
+        counts = counts[counts > 0]
+        if len(counts) <= n_out or grid_size <= 1:
+            break
+        grid_size //= 2
+
+    # Find the largest per-cell cap that keeps the total within budget
+    lo, hi = 1, int(counts.max())
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if np.minimum(counts, mid).sum() <= n_out:
+            lo = mid
+        else:
+            hi = mid - 1
+    cap = lo
+
+    order = np.random.default_rng(seed).permutation(n)
+    shuffled_cells = cells[order]
+    sort = np.argsort(shuffled_cells, kind="stable")
+    sorted_cells = shuffled_cells[sort]
+    starts = np.searchsorted(sorted_cells, sorted_cells, side="left")
+    rank = np.arange(n) - starts
+    return np.sort(order[sort[rank < cap]])
+
+
+# Reduce a time-ordered series to at most `budget` points, returning (frame, total_points)
+def downsample_series(df, x_col, y_col, budget=DEFAULT_POINT_BUDGET, method="LTTB"):
+    total = len(df)
+    if method == "None" or total <= budget:
+        return df, total
+
+    y = _numeric_values(df[y_col])
+    if y is None:
+        return df, total
+
+    x = _numeric_values(df[x_col])
+    if x is not None:
+        order = np.argsort(x, kind="stable")
+        x, y = x[order], y[order]
+    else:
+        order = np.arange(total)
+        x = order.astype("float64")
+
+    valid = ~(np.isnan(x) | np.isnan(y))
+    order, x, y = order[valid], x[valid], y[valid]
+
+    if method == "Min/Max (M4)":
+        keep = minmax_indices(x, y, budget)
+    else:
+        keep = lttb_indices(x, y, budget)
+    return df.iloc[order[keep]], total
+
+
+# Reduce a scatter/bubble point cloud to at most `budget` points, returning (frame, total_points)
+def downsample_points(df, x_col, y_col, budget=DEFAULT_POINT_BUDGET):
+    total = len(df)
+    if total <= budget:
+        return df, total
+
+    x = _numeric_values(df[x_col])
+    y = _numeric_values(df[y_col])
+    if x is None:
+        x = pd.factorize(df[x_col])[0].astype("float64")
+    if y is None:
+        y = pd.factorize(df[y_col])[0].astype("float64")
+
+    valid = np.flatnonzero(~(np.isnan(x) | np.isnan(y)))
+    keep = density_sample_indices(x[valid], y[valid], budget)
+    return df.iloc[valid[keep]], total
@@ -0,0 +1,61 @@
+import os
+import threading
+from collections import OrderedDict
+
+FIGURE_CACHE_MAX_BYTES = int(os.environ.get("DATAVIS_FIGURE_CACHE_BYTES", 256 * 1024 ** 2))
+
+
+# LRU cache of built figures keyed by (dataset hash, chart type, chart spec), bounded by the total size
+# of their serialized payloads
+class FigureCache:
+    def __init__(self, max_bytes=FIGURE_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    # Entry for `key` without counting a hit or miss or refreshing its recency
+    def peek(self, key):
+        with self.lock:
+            return self.entries.get(key)
+
+    def put(self, key, figure, size, caption=None):
+        entry = {"figure": figure, "caption": caption, "bytes": size}
+        with self.lock:
+            if key in self.entries:
+                self.total_bytes -= self.entries.pop(key)["bytes"]
+            # Figures larger than the whole budget are returned but never stored
+            if entry["bytes"] > self.max_bytes:
+                return entry
+            self.entries[key] = entry
+            self.total_bytes += entry["bytes"]
+            while self.total_bytes > self.max_bytes:
+                _, evicted = self.entries.popitem(last=False)
+                self.total_bytes -= evicted["bytes"]
+        return entry
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.total_bytes = 0
+
+    def stats(self):
+        with self.lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self.entries),
+                "bytes": self.total_bytes,
+            }
@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+
+OTHER_LABEL = "Other"
+
+
+# Aggregate an edge list into weighted links over a compact node index.
+# Nodes outside the `top_k` heaviest or lighter than `min_weight` are folded into one "Other" node.
+def prepare_graph(df, source_col, target_col, value_col, top_k=0, min_weight=0.0):
+    n = len(df)
+    # One factorize over both endpoint columns gives every node a single integer code
+    codes, labels = pd.factorize(pd.concat([df[source_col], df[target_col]], ignore_index=True))
+    source, target = codes[:n], codes[n:]
+    weights = pd.to_numeric(df[value_col], errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+
+    valid = (source >= 0) & (target >= 0) & ~np.isnan(weights)
+    source, target, weights = source[valid], target[valid], weights[valid]
+
+    n_nodes = len(labels)
+    node_weight = np.bincount(source, weights, n_nodes) + np.bincount(target, weights, n_nodes)
+    keep = node_weight >= min_weight
+    if top_k and top_k < n_nodes:
+        ranked = np.argsort(-node_weight, kind="stable")
+        in_top = np.zeros(n_nodes, dtype=bool)
+        in_top[ranked[:top_k]] = True
+        keep &= in_top
+
+    # Renumber kept nodes and send the rest to a trailing "Other" node
+    node_labels = [str(label) for label in labels[keep]]
+    remap = np.full(n_nodes, len(node_labels), dtype=np.int64)
+    remap[keep] = np.arange(len(node_labels))
+    if not keep.all():
+        node_labels.append(OTHER_LABEL)
+    source, target = remap[source], remap[target]
+
+    # A single grouped sum over combined (source, target) keys merges duplicate edges
+    n_out = len(node_labels)
+    keys, inverse = np.unique(source * n_out + target, return_inverse=True)
+    values = np.bincount(inverse, weights)
+    link_source, link_target = keys // n_out, keys % n_out
+
+    # Flows from Other back into itself carry no information and would form a cycle
+    if not keep.all():
+        other = n_out - 1
+        not_self = ~((link_source == other) & (link_target == other))
+        link_source, link_target, values = link_source[not_self], link_target[not_self], values[not_self]
+
+    return {
+        "labels": node_labels,
+        "source": link_source,
+        "target": link_target,
+        "value": values,
+        "rows": int(valid.sum()),
+    }
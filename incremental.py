@@ -0,0 +1,118 @@
+import numpy as np
+import pandas as pd
+
+from downsampling import DEFAULT_POINT_BUDGET
+from preaggregate import MAX_AUTO_BINS, axis_values
+
+# Aggregates that absorb appended rows one chunk at a time. Each keeps state bounded by its output size,
+# so an update costs time proportional to the new rows, not to everything seen so far.
+
+
+# Whether a column can be used as a numeric or time axis by the streaming aggregates
+def is_axis_dtype(dtype):
+    return pd.api.types.is_numeric_dtype(dtype) or pd.api.types.is_datetime64_any_dtype(dtype)
+
+
+# Running sum of `value_col` per distinct combination of `key_cols`, as used by bar charts and edge lists
+class GroupSum:
+    def __init__(self, key_cols, value_col):
+        self.key_cols = list(key_cols)
+        self.value_col = value_col
+        self.sums = None
+        self.rows = 0
+
+    def update(self, chunk):
+        # Keys go through positional names so a column can serve as both key and value
+        frame = pd.DataFrame({f"key{i}": np.asarray(chunk[col]) for i, col in enumerate(self.key_cols)})
+        frame["value"] = pd.to_numeric(chunk[self.value_col], errors="coerce").to_numpy()
+        frame = frame.dropna()
+        partial = frame.groupby([f"key{i}" for i in range(len(self.key_cols))], sort=False)["value"].sum()
+        self.sums = partial if self.sums is None else self.sums.add(partial, fill_value=0)
+        self.rows += len(frame)
+
+    def result(self):
+        if self.sums is None:
+            return {"frame": pd.DataFrame(columns=self.key_cols + [self.value_col]), "rows": 0}
+        frame = self.sums.reset_index()
+        frame.columns = self.key_cols + [self.value_col]
+        return {"frame": frame, "rows": self.rows}
+
+
+# Histogram with bins aligned to multiples of a width that doubles, merging neighbouring bins,
+# whenever the data's range would need more than `max_bins` bins
+class StreamingHistogram:
+    def __init__(self, col, max_bins=MAX_AUTO_BINS):
+        self.col = col
+        self.max_bins = max(int(max_bins), 2)
+        self.width = None
+        self.counts = pd.Series(dtype="int64")
+        self.rows = 0
+
+    def update(self, chunk):
+        values = axis_values(chunk[self.col])
+        values = values[np.isfinite(values)]
+        if len(values) == 0:
+            return
+        if self.width is None:
+            spread = values.max() - values.min()
+            self.width = spread / (self.max_bins - 1) if spread > 0 else max(abs(values[0]), 1.0) / self.max_bins
+        bins, counts = np.unique(np.floor(values / self.width).astype("int64"), return_counts=True)
+        self.counts = self.counts.add(pd.Series(counts, index=bins), fill_value=0).astype("int64")
+        while self.counts.index.max() - self.counts.index.min() + 1 > self.max_bins:
+            self.width *= 2
+            self.counts = self.counts.groupby(self.counts.index // 2).sum()
+        self.rows += len(values)
+
+    def result(self):
+        if self.counts.empty:
+            return {"edges": np.array([0.0, 1.0]), "counts": np.array([0]), "rows": 0}
+        first, last = self.counts.index.min(), self.counts.index.max()
+        counts = self.counts.reindex(np.arange(first, last + 1), fill_value=0).to_numpy()
+        return {"edges": np.arange(first, last + 2) * self.width, "counts": counts, "rows": self.rows}
+
+
+# Min/Max (M4) reduction of a series over x buckets that double in width as the x range grows.
+# Each bucket keeps its first, last, lowest and highest points, so at most `budget` points are drawn.
+class StreamingMinMax:
+    def __init__(self, x_col, y_col, budget=DEFAULT_POINT_BUDGET):
+        self.x_col = x_col
+        self.y_col = y_col
+        self.max_buckets = max(int(budget) // 4, 1)
+        self.width = None
+        self.points = pd.DataFrame({"bucket": np.array([], dtype="int64"), "x": [], "y": []})
+        self.datetime_x = None
+        self.rows = 0
+
+    @staticmethod
+    def _reduce(points):
+        grouped = points.groupby("bucket")
+        keep = pd.concat([grouped["x"].idxmin(), grouped["x"].idxmax(), grouped["y"].idxmin(), grouped["y"].idxmax()])
+        return points.loc[keep.drop_duplicates()].reset_index(drop=True)
+
+    def update(self, chunk):
+        if self.datetime_x is None:
+            self.datetime_x = pd.api.types.is_datetime64_any_dtype(chunk[self.x_col])
+        x = axis_values(chunk[self.x_col])
+        y = pd.to_numeric(chunk[self.y_col], errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+        valid = ~(np.isnan(x) | np.isnan(y))
+        x, y = x[valid], y[valid]
+        if len(x) == 0:
+            return
+        if self.width is None:
+            spread = x.max() - x.min()
+            self.width = spread / (self.max_buckets - 1) if spread > 0 and self.max_buckets > 1 else max(spread, 1.0)
+        new = pd.DataFrame({"bucket": np.floor(x / self.width).astype("int64"), "x": x, "y": y})
+        points = self._reduce(pd.concat([self.points, new], ignore_index=True))
+        while points["bucket"].max() - points["bucket"].min() + 1 > self.max_buckets:
+            self.width *= 2
+            points["bucket"] //= 2
+            points = self._reduce(points)
+        self.points = points
+        self.rows += len(x)
+
+    def result(self):
+        points = self.points.sort_values("x", kind="stable")
+        x = points["x"].to_numpy()
+        if self.datetime_x:
+            x = pd.to_datetime(x.astype("int64"))
+        return {"frame": pd.DataFrame({self.x_col: x, self.y_col: points["y"].to_numpy()}), "rows": self.rows}
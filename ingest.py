@@ -0,0 +1,226 @@
+import time
+
+import numpy as np
+import pandas as pd
+from pandas.tseries.api import guess_datetime_format
+
+from dataset_cache import content_hash, load_cached_frame, store_cached_frame
+from perf import PeakRss
+from xlsx_reader import read_xlsx
+
+CSV_CHUNK_ROWS = 250_000
+CATEGORY_RATIO = 0.5
+DATE_SAMPLE_ROWS = 100
+
+
+# Downcast integers and losslessly representable floats to the smallest numeric type
+def downcast_numeric(series):
+    if pd.api.types.is_integer_dtype(series):
+        return pd.to_numeric(series, downcast="integer")
+    if pd.api.types.is_float_dtype(series):
+        downcast = series.astype("float32")
+        if np.array_equal(downcast.to_numpy(dtype="float64"), series.to_numpy(dtype="float64"), equal_nan=True):
+            return downcast
+    return series
+
+
+# Guess one datetime format per text column from a sample, so every chunk is parsed without re-inference
+def detect_date_formats(df):
+    formats = {}
+    for col in df.columns:
+        if not _is_text(df[col]):
+            continue
+        sample = df[col].dropna().astype(str).head(DATE_SAMPLE_ROWS)
+        if sample.empty:
+            continue
+        fmt = guess_datetime_format(sample.iloc[0])
+        if fmt is None:
+            continue
+        parsed = pd.to_datetime(sample, format=fmt, errors="coerce")
+        if parsed.notna().all():
+            formats[col] = fmt
+    return formats
+
+
+def _is_text(series):
+    return pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series)
+
+
+# Pick the text columns whose cardinality is low enough to store as `category`
+def detect_category_columns(df, date_formats):
+    columns = []
+    for col in df.columns:
+        if col in date_formats:
+            continue
+        if not _is_text(df[col]):
+            continue
+        non_null = df[col].count()
+        if non_null and df[col].nunique() / non_null <= CATEGORY_RATIO:
+            columns.append(col)
+    return columns
+
+
+# Dtypes chosen from a first chunk and kept for every later one: date formats, category columns
+# and the other columns holding text
+def detect_schema(df):
+    date_formats = detect_date_formats(df)
+    category_columns = detect_category_columns(df, date_formats)
+    text_columns = [col for col in df.columns
+                    if col not in date_formats and col not in category_columns and _is_text(df[col])]
+    return {"date_formats": date_formats, "category_columns": category_columns, "text_columns": text_columns}
+
+
+# read_csv dtypes for a schema. Columns that hold text are read as strings, so a chunk where they
+# are empty or look numeric gets the same dtype as the others.
+def read_dtypes(schema):
+    return {col: str for col in [*schema["date_formats"], *schema["category_columns"], *schema["text_columns"]]}
+
+
+# Columns of an optimized chunk that no longer fit the schema: dates the detected format did not
+# parse, and text in a column the schema expects to be numeric
+def schema_conflicts(chunk, schema):
+    conflicts = []
+    for col in chunk.columns:
+        if col in schema["date_formats"]:
+            if not pd.api.types.is_datetime64_any_dtype(chunk[col]):
+                conflicts.append(col)
+        elif col not in schema["category_columns"] and col not in schema["text_columns"] and _is_text(chunk[col]):
+            conflicts.append(col)
+    return conflicts
+
+
+# The schema with `columns` read as plain text from now on
+def demote_to_text(schema, columns):
+    return {
+        "date_formats": {col: fmt for col, fmt in schema["date_formats"].items() if col not in columns},
+        "category_columns": [col for col in schema["category_columns"] if col not in columns],
+        "text_columns": schema["text_columns"] + [col for col in columns if col not in schema["text_columns"]],
+    }
+
+
+# Apply the detected date formats, categories and numeric downcasts to one frame or chunk
+def optimize_frame(df, date_formats, category_columns):
+    for col in df.columns:
+        if col in date_formats:
+            parsed = pd.to_datetime(df[col], format=date_formats[col], errors="coerce")
+            # A format that fails on any value leaves the column as text instead of turning it into NaT
+            if not (parsed.isna() & df[col].notna()).any():
+                df[col] = parsed
+        elif col in category_columns:
+            df[col] = df[col].astype("category")
+        else:
+            df[col] = downcast_numeric(df[col])
+    return df
+
+
+# Optimize the dtypes of an already loaded frame
+def optimize_dtypes(df):
+    date_formats = detect_date_formats(df)
+    return optimize_frame(df, date_formats, detect_category_columns(df, date_formats))
+
+
+# Concatenate optimized chunks. Each category column is first given the union of every chunk's
+# categories, so chunks that saw different values (or none at all) share one categorical dtype.
+def concat_chunks(chunks, category_columns):
+    if len(chunks) == 1:
+        return chunks[0]
+    for col in category_columns:
+        categories = pd.Index(pd.unique(np.concatenate(
+            [chunk[col].cat.categories.to_numpy(dtype=object) for chunk in chunks])))
+        for chunk in chunks:
+            chunk[col] = chunk[col].cat.set_categories(categories)
+    return pd.concat(chunks, ignore_index=True)
+
+
+# Load statistics shared by every ingest path. `peak_memory` is the measured peak growth of the process's
+# resident memory during the load, or None where it cannot be measured.
+def load_stats(df, started, peak_memory):
+    seconds = time.perf_counter() - started
+    memory = int(df.memory_usage(deep=True).sum())
+    return {
+        "rows": len(df),
+        "seconds": seconds,
+        "rows_per_second": len(df) / seconds if seconds > 0 else float("inf"),
+        "peak_memory_bytes": peak_memory,
+        "memory_bytes": memory,
+    }
+
+
+# One pass over a CSV, optimizing each chunk as it arrives. Without a schema, dtypes are chosen from the
+# first chunk and later chunks are read without dtype hints, which is enough for most files. Returns
+# (chunks, schema, complete); an incomplete pass stopped at a chunk that did not fit and must be
+# repeated with the returned schema.
+def _read_csv_pass(file, chunk_rows, schema, peak):
+    chunks = []
+    hinted = schema is not None
+    # Closing the reader explicitly keeps it from closing `file` when it is garbage collected after an early return
+    with pd.read_csv(file, chunksize=chunk_rows, dtype=read_dtypes(schema) if hinted else None) as reader:
+        for chunk in reader:
+            if schema is None:
+                schema = detect_schema(chunk)
+            # Unhinted, a text column that is empty or looks numeric in this chunk comes back as numbers
+            elif not hinted and not all(_is_text(chunk[col]) for col in read_dtypes(schema)):
+                return chunks, schema, False
+            chunk = optimize_frame(chunk, schema["date_formats"], schema["category_columns"])
+            peak.sample()
+            conflicts = schema_conflicts(chunk, schema)
+            if conflicts:
+                return chunks, demote_to_text(schema, conflicts), False
+            chunks.append(chunk)
+    return chunks, schema, True
+
+
+# Stream a CSV in chunks, optimizing each chunk as it arrives; returns (frame, stats).
+# Dtypes are chosen from the first chunk. If a later chunk does not fit them (text in a numeric column,
+# dates in another format, text columns that read as numbers), the file is read again with those
+# columns as text.
+def read_csv_optimized(file, chunk_rows=CSV_CHUNK_ROWS):
+    started = time.perf_counter()
+    origin = file.tell()
+    with PeakRss() as peak:
+        schema = None
+        complete = False
+        while not complete:
+            file.seek(origin)
+            chunks, schema, complete = _read_csv_pass(file, chunk_rows, schema, peak)
+        df = concat_chunks(chunks, schema["category_columns"]) if chunks else pd.DataFrame()
+    return df, load_stats(df, started, peak.growth)
+
+
+# Stream one worksheet of an .xlsx file, decoding only the chosen columns; returns (frame, stats)
+def read_excel_optimized(file, sheet=None, columns=None, progress=None):
+    started = time.perf_counter()
+    with PeakRss() as peak:
+        df = optimize_dtypes(read_xlsx(file, sheet, columns, progress))
+    return df, load_stats(df, started, peak.growth)
+
+
+# Dataset cache key of a file: its content plus the settings that shape the parsed frame
+def file_hash(file, name, sheet=None, columns=None):
+    return content_hash(file, name, sheet, sorted(columns) if columns else None)
+
+
+# Load a CSV or Excel file through the dataset cache; returns (frame, stats).
+# `sheet` and `columns` pick what to read from an Excel workbook; `progress` receives the fraction parsed.
+# Callers that already know the file's `dataset_hash` skip hashing its content again.
+def load_file(file, name, sheet=None, columns=None, progress=None, dataset_hash=None):
+    started = time.perf_counter()
+    columns = sorted(columns) if columns else None
+    if dataset_hash is None:
+        dataset_hash = file_hash(file, name, sheet, columns)
+    with PeakRss() as peak:
+        df = load_cached_frame(dataset_hash)
+    if df is not None:
+        stats = load_stats(df, started, peak.growth)
+        stats.update(source="cache", dataset_hash=dataset_hash)
+        return df, stats
+
+    if name.endswith(".csv"):
+        df, stats = read_csv_optimized(file)
+    elif name.endswith(".xlsx"):
+        df, stats = read_excel_optimized(file, sheet, columns, progress)
+    else:
+        raise ValueError(f"Unsupported file type: {name}")
+    store_cached_frame(dataset_hash, df)
+    stats.update(source="parse", dataset_hash=dataset_hash)
+    return df, stats
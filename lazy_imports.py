@@ -0,0 +1,21 @@
+import importlib
+import sys
+import time
+
+# Seconds spent on each import that went through lazy_import, plus startup phases recorded by callers
+import_timings = {}
+
+
+# Import a module on first use and remember how long the cold import took
+def lazy_import(name):
+    module = sys.modules.get(name)
+    if module is None:
+        started = time.perf_counter()
+        module = importlib.import_module(name)
+        import_timings[name] = time.perf_counter() - started
+    return module
+
+
+# Record the duration of a startup phase once; later reruns keep the cold value
+def record_timing(name, seconds):
+    import_timings.setdefault(name, seconds)
@@ -0,0 +1,156 @@
+import glob
+import hashlib
+import io
+import os
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+from ingest import concat_chunks, demote_to_text, detect_schema, optimize_frame, read_dtypes, schema_conflicts
+
+# Largest slice of a file parsed at once, so the first read of a big file stays bounded in memory
+READ_BLOCK_BYTES = 64 * 1024 ** 2
+DEFAULT_REFRESH_SECONDS = 5
+# Aggregates kept up to date per source; the least recently used are dropped beyond this
+MAX_AGGREGATES = 16
+
+
+# Raised while parsing when appended rows do not fit the dtypes chosen so far
+class _SchemaChanged(Exception):
+    def __init__(self, columns):
+        super().__init__(columns)
+        self.columns = columns
+
+
+# A CSV file, or a directory of CSV files, that keeps growing. Each poll reads only the bytes appended since
+# the last one, parses complete lines into optimized chunks and folds them into every registered aggregate.
+class LiveSource:
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        # Columns read as text because appended rows did not fit their first dtype
+        self.text_fallbacks = []
+        self._reset()
+
+    def _reset(self, schema=None):
+        # Byte offset of the first unread byte in each file
+        self.offsets = {}
+        self.header = None
+        # Dtypes chosen from the first chunk (see ingest.detect_schema), kept for every later one
+        self.schema = schema
+        self.chunks = []
+        self.rows = 0
+        self.aggregates = OrderedDict()
+
+    def files(self):
+        if os.path.isdir(self.path):
+            return sorted(glob.glob(os.path.join(self.path, "*.csv")))
+        if os.path.isfile(self.path):
+            return [self.path]
+        raise FileNotFoundError(f"No such file or directory: {self.path}")
+
+    @property
+    def columns(self):
+        return list(self.header or [])
+
+    @property
+    def dtypes(self):
+        return self.chunks[0].dtypes if self.chunks else pd.Series(dtype=object)
+
+    # Identifies the data seen so far, so figures are cached until new rows arrive
+    @property
+    def dataset_hash(self):
+        return hashlib.sha256(f"{os.path.abspath(self.path)}:{self.rows}".encode()).hexdigest()
+
+    def _parse(self, data, with_header):
+        chunk = pd.read_csv(io.BytesIO(data), header=0 if with_header else None,
+                            names=None if with_header else self.header,
+                            dtype=read_dtypes(self.schema) if self.schema is not None else None)
+        if self.header is None:
+            self.header = chunk.columns.tolist()
+        elif with_header and chunk.columns.tolist() != self.header:
+            raise ValueError(f"Columns of {self.path} changed: expected {self.header}, got {chunk.columns.tolist()}")
+        if self.schema is None:
+            # A header-only chunk (a logger that writes its header first) says nothing about the dtypes,
+            # so detection waits for the first chunk with rows
+            if not len(chunk):
+                return chunk
+            self.schema = detect_schema(chunk)
+        chunk = optimize_frame(chunk, self.schema["date_formats"], self.schema["category_columns"])
+        conflicts = schema_conflicts(chunk, self.schema)
+        if conflicts:
+            raise _SchemaChanged(conflicts)
+        return chunk
+
+    # Complete lines appended to one file since the last poll, as optimized chunks
+    def _read_new(self, file):
+        chunks = []
+        offset = self.offsets.get(file, 0)
+        size = os.path.getsize(file)
+        with open(file, "rb") as handle:
+            handle.seek(offset)
+            while offset < size:
+                data = handle.read(min(READ_BLOCK_BYTES, size - offset))
+                # A partly written last line waits for the next poll
+                end = data.rfind(b"\n") + 1
+                if end == 0:
+                    if len(data) < READ_BLOCK_BYTES:
+                        break
+                    raise ValueError(f"Line longer than {READ_BLOCK_BYTES:,} bytes in {file}")
+                handle.seek(offset + end)
+                chunk = self._parse(data[:end], with_header=offset == 0)
+                offset += end
+                if len(chunk):
+                    chunks.append(chunk)
+        self.offsets[file] = offset
+        return chunks
+
+    # Read what was appended since the last poll; returns the number of new rows
+    def poll(self):
+        with self.lock:
+            files = self.files()
+            # A file that shrank was truncated or replaced, so everything is read again
+            if any(os.path.getsize(file) < self.offsets.get(file, 0) for file in files):
+                self._reset()
+            while True:
+                try:
+                    new_chunks = [chunk for file in files for chunk in self._read_new(file)]
+                    break
+                except _SchemaChanged as changed:
+                    # Columns the new rows do not fit (text in a numeric column, dates in another format)
+                    # become text, and everything is read again with them as text
+                    schema = demote_to_text(self.schema, changed.columns)
+                    self.text_fallbacks.extend(col for col in changed.columns if col not in self.text_fallbacks)
+                    self._reset(schema)
+            for chunk in new_chunks:
+                for aggregate in self.aggregates.values():
+                    aggregate.update(chunk)
+            self.chunks.extend(new_chunks)
+            new_rows = sum(len(chunk) for chunk in new_chunks)
+            self.rows += new_rows
+            return new_rows
+
+    # Result of the aggregate registered under `key`, built by `factory` and fed every chunk seen so far
+    # on first use, then updated incrementally by each poll
+    def aggregate(self, key, factory):
+        with self.lock:
+            aggregate = self.aggregates.get(key)
+            if aggregate is None:
+                aggregate = factory()
+                for chunk in self.chunks:
+                    aggregate.update(chunk)
+                self.aggregates[key] = aggregate
+                if len(self.aggregates) > MAX_AGGREGATES:
+                    self.aggregates.popitem(last=False)
+            self.aggregates.move_to_end(key)
+            return aggregate.result()
+
+    # Every row seen so far as one frame; chunks are merged in place so later calls only append new ones
+    def frame(self):
+        with self.lock:
+            if not self.chunks:
+                return pd.DataFrame(columns=self.columns)
+            if len(self.chunks) > 1:
+                self.chunks = [concat_chunks(self.chunks, self.schema["category_columns"])]
+            return self.chunks[0]
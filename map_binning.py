@@ -0,0 +1,71 @@
+from functools import reduce
+
+import numpy as np
+import pandas as pd
+
+MAP_MODES = ["Auto", "Markers", "Clusters", "Heatmap"]
+MARKER_LIMIT = 500
+CLUSTER_LIMIT = 50000
+MAX_MAP_BINS = 20000
+
+_GEOHASH_ALPHABET = np.array(list("0123456789bcdefghjkmnpqrstuvwxyz"))
+
+
+# Pick a map mode from the number of points when the user leaves it on "Auto"
+def resolve_map_mode(mode, n_points):
+    if mode != "Auto":
+        return mode
+    if n_points <= MARKER_LIMIT:
+        return "Markers"
+    if n_points <= CLUSTER_LIMIT:
+        return "Clusters"
+    return "Heatmap"
+
+
+# Integer geohash codes of coordinate arrays at the given precision (1-12 characters)
+def geohash_codes(lat, lon, precision=6):
+    total_bits = 5 * precision
+    lon_bits = (total_bits + 1) // 2
+    lat_bits = total_bits // 2
+
+    lat_q = np.clip(((np.asarray(lat) + 90.0) / 180.0 * (1 << lat_bits)).astype(np.int64), 0, (1 << lat_bits) - 1)
+    lon_q = np.clip(((np.asarray(lon) + 180.0) / 360.0 * (1 << lon_bits)).astype(np.int64), 0, (1 << lon_bits) - 1)
+
+    # Interleave bits starting with longitude, most significant first
+    code = np.zeros(len(lat_q), dtype=np.int64)
+    for bit in range(total_bits):
+        if bit % 2 == 0:
+            source, shift = lon_q, lon_bits - 1 - bit // 2
+        else:
+            source, shift = lat_q, lat_bits - 1 - bit // 2
+        code = (code << 1) | ((source >> shift) & 1)
+    return code
+
+
+# Convert integer geohash codes to their base32 string form
+def geohash_to_string(codes, precision=6):
+    codes = np.asarray(codes, dtype=np.int64)
+    chars = [_GEOHASH_ALPHABET[(codes >> (5 * (precision - 1 - i))) & 31] for i in range(precision)]
+    return reduce(np.char.add, chars)
+
+
+# Aggregate points into geohash bins, coarsening until the bin count fits `max_bins`
+def aggregate_geohash_bins(lat, lon, max_bins=MAX_MAP_BINS, precision=7):
+    lat = np.asarray(lat, dtype="float64")
+    lon = np.asarray(lon, dtype="float64")
+    cells = geohash_codes(lat, lon, precision)
+    while True:
+        codes, uniques = pd.factorize(cells)
+        if len(uniques) <= max_bins or precision <= 1:
+            break
+        # Dropping the last character of a geohash is a 5-bit shift
+        cells = cells >> 5
+        precision -= 1
+
+    counts = np.bincount(codes)
+    return pd.DataFrame({
+        "geohash": geohash_to_string(uniques, precision),
+        "lat": np.bincount(codes, weights=lat) / counts,
+        "lon": np.bincount(codes, weights=lon) / counts,
+        "count": counts,
+    })
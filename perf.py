@@ -0,0 +1,140 @@
+import json
+import os
+import platform
+import threading
+import time
+from contextlib import contextmanager
+
+# JSON-lines file every instrumented run is appended to. Logging is opt-in: the file is never trimmed, so it
+# stays off unless DATAVIS_PERF_LOG names a path
+PERF_LOG_PATH = os.environ.get("DATAVIS_PERF_LOG", "")
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+RSS_SAMPLE_SECONDS = 0.01
+
+_local = threading.local()
+_log_lock = threading.Lock()
+
+
+# Resident set size of this process in bytes, or None where /proc is unavailable
+def rss_bytes():
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * PAGE_SIZE
+    except OSError:
+        return None
+
+
+# Peak resident set size of this process in bytes, or None where neither /proc nor resource is available
+def peak_rss_bytes():
+    # VmHWM belongs to this process's own address space; ru_maxrss can carry over the parent's peak through fork/exec
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    # resource only exists on Unix (not on Windows), so it is imported here rather than at module load
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in kilobytes on Linux and bytes on macOS
+    return peak if platform.system() == "Darwin" else peak * 1024
+
+
+# Highest resident set size reached while a block runs, above the size at its start. A background thread
+# samples every `interval` seconds; callers may also sample() at known high points, because a long C call
+# holding the GIL keeps the thread from running.
+class PeakRss:
+    def __init__(self, interval=RSS_SAMPLE_SECONDS):
+        self.interval = interval
+        self.start = None
+        self.peak = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def __enter__(self):
+        self.start = self.peak = rss_bytes()
+        if self.start is not None:
+            self._thread = threading.Thread(target=self._run, name="rss-sampler", daemon=True)
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+        self.sample()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+    def sample(self):
+        rss = rss_bytes()
+        if rss is not None and rss > self.peak:
+            self.peak = rss
+
+    # Peak growth in bytes, or None where resident memory cannot be read
+    @property
+    def growth(self):
+        return None if self.start is None else self.peak - self.start
+
+
+# Collect every span recorded on this thread while the block runs
+@contextmanager
+def collect_spans():
+    spans = []
+    collectors = getattr(_local, "collectors", None)
+    if collectors is None:
+        collectors = _local.collectors = []
+    collectors.append(spans)
+    try:
+        yield spans
+    finally:
+        collectors.remove(spans)
+
+
+# Time a named stage and hand it to every active collector on this thread. The block receives the span's
+# record and may add fields to it, such as payload_bytes; the resident set size after the stage and its
+# change over the stage are added when available.
+@contextmanager
+def span(name, **fields):
+    record = {"name": name, **fields}
+    rss_before = rss_bytes()
+    started = time.perf_counter()
+    try:
+        yield record
+    finally:
+        record["seconds"] = time.perf_counter() - started
+        rss_after = rss_bytes()
+        if rss_after is not None:
+            record["rss_bytes"] = rss_after
+            record["rss_delta_bytes"] = rss_after - rss_before
+        for spans in getattr(_local, "collectors", ()):
+            spans.append(record)
+
+
+# Hand spans recorded on another thread, such as a chart job's, to every active collector on this thread
+def record_spans(records):
+    for spans in getattr(_local, "collectors", ()):
+        spans.extend(records)
+
+
+# Total seconds recorded under one span name
+def span_seconds(spans, name):
+    return sum(s["seconds"] for s in spans if s["name"] == name)
+
+
+# Append spans to the JSON-lines log, one line per span carrying the shared `context` fields
+def write_perf_log(spans, path=PERF_LOG_PATH, **context):
+    if not path or not spans:
+        return
+    lines = "".join(json.dumps({**context, **record}, default=str) + "\n" for record in spans)
+    with _log_lock:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        # One write per run keeps lines from concurrent sessions from interleaving
+        with open(path, "a") as log:
+            log.write(lines)
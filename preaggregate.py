@@ -0,0 +1,157 @@
+import numpy as np
+import pandas as pd
+
+DISTRIBUTION_MODES = ["Auto", "Pre-aggregated", "Raw"]
+# "Auto" pre-aggregates once a distribution chart would ship more rows than this
+PREAGGREGATE_MIN_ROWS = 50_000
+MAX_AUTO_BINS = 200
+HEATMAP_BINS = 50
+OUTLIER_SAMPLE = 200
+MAX_GROUPS = 50
+KDE_POINTS = 128
+
+
+# Whether a distribution chart over `n_rows` rows should be drawn from server-side statistics
+def should_preaggregate(mode, n_rows):
+    if mode == "Pre-aggregated":
+        return True
+    if mode == "Raw":
+        return False
+    return n_rows > PREAGGREGATE_MIN_ROWS
+
+
+# Axis values as float64 (datetimes as nanoseconds), with missing values as NaN
+def axis_values(series):
+    if pd.api.types.is_datetime64_any_dtype(series):
+        values = series.to_numpy(dtype="datetime64[ns]")
+        numeric = values.astype("int64").astype("float64")
+        numeric[np.isnat(values)] = np.nan
+        return numeric
+    return pd.to_numeric(series, errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+
+
+# Counts per value of a non-numeric column; beyond `max_values`, the least frequent are folded into "Other"
+def category_counts(series, max_values=MAX_AUTO_BINS):
+    counts = series.value_counts()
+    if len(counts) > max_values:
+        counts = pd.concat([counts.iloc[:max_values - 1], pd.Series({"Other": counts.iloc[max_values - 1:].sum()})])
+    return {"categories": [str(value) for value in counts.index], "counts": counts.to_numpy(), "rows": int(counts.sum())}
+
+
+# Histogram counts of a numeric or datetime column (datetime edges in nanoseconds); `bins=0` picks the
+# bin count automatically. Other columns are counted per value, as a client-side histogram would.
+def histogram_bins(series, bins=0):
+    datetime = pd.api.types.is_datetime64_any_dtype(series)
+    if not (datetime or pd.api.types.is_numeric_dtype(series)):
+        return category_counts(series)
+    values = axis_values(series)
+    values = values[np.isfinite(values)]
+    if bins:
+        edges = np.histogram_bin_edges(values, bins=int(bins))
+    else:
+        edges = np.histogram_bin_edges(values, bins="auto")
+        if len(edges) - 1 > MAX_AUTO_BINS:
+            edges = np.histogram_bin_edges(values, bins=MAX_AUTO_BINS)
+    counts, edges = np.histogram(values, bins=edges)
+    return {"edges": edges, "counts": counts, "rows": len(values), "datetime": datetime}
+
+
+# Center of the equal-width bin each value falls in, NaN for missing values
+def _bin_centers(values, bins):
+    finite = np.isfinite(values)
+    edges = np.histogram_bin_edges(values[finite], bins=bins)
+    centers = (edges[:-1] + edges[1:]) / 2
+    codes = np.clip(np.searchsorted(edges, values, side="right") - 1, 0, bins - 1)
+    return np.where(finite, centers[codes], np.nan)
+
+
+# Keys with at most `bins` distinct values, for a 2D aggregate axis or a grouping. Numeric and datetime
+# columns with more distinct values are binned and keyed by bin center; other columns keep their
+# `bins - 1` most frequent values and fold the rest into "Other".
+def _axis_keys(series, bins):
+    if series.nunique() <= bins:
+        return series
+    if pd.api.types.is_datetime64_any_dtype(series):
+        centers = pd.to_datetime(_bin_centers(axis_values(series), bins), unit="ns")
+        if series.dt.tz is not None:
+            centers = centers.tz_localize("UTC").tz_convert(series.dt.tz)
+        return pd.Series(centers, index=series.index)
+    if pd.api.types.is_numeric_dtype(series):
+        return pd.Series(_bin_centers(axis_values(series), bins), index=series.index)
+    top = series.value_counts().index[:bins - 1]
+    return series.astype(object).where(series.isin(top) | series.isna(), "Other")
+
+
+# Sum of `z` over (x, y) cells as a dense matrix, the same aggregate density_heatmap draws.
+# Both axes are capped at `bins` keys, so the grid never exceeds bins x bins cells.
+def heatmap_grid(df, x_col, y_col, z_col, bins=HEATMAP_BINS):
+    cells = pd.DataFrame({
+        "x": _axis_keys(df[x_col], bins),
+        "y": _axis_keys(df[y_col], bins),
+        "z": pd.to_numeric(df[z_col], errors="coerce"),
+    }).dropna(subset=["x", "y"])
+    grid = cells.groupby(["y", "x"], observed=True)["z"].sum().unstack("x")
+    return {"x": grid.columns.tolist(), "y": grid.index.tolist(), "z": grid.to_numpy(), "rows": len(cells)}
+
+
+# Values of `y_col` split by `x_col`, keeping group order stable
+def _groups(df, y_col, x_col, max_groups=MAX_GROUPS):
+    values = pd.to_numeric(df[y_col], errors="coerce")
+    keep = values.notna()
+    if x_col is None:
+        return [("", values[keep].to_numpy(dtype="float64"))]
+    keys = _axis_keys(df[x_col], max_groups)
+    keep &= keys.notna()
+    grouped = values[keep].groupby(keys[keep], observed=True, sort=True)
+    return [(name, group.to_numpy(dtype="float64")) for name, group in grouped]
+
+
+# Five-number summaries with 1.5 IQR whiskers per group, plus a bounded sample of outliers
+def box_summaries(df, y_col, x_col=None, outlier_sample=OUTLIER_SAMPLE, seed=0):
+    rng = np.random.default_rng(seed)
+    summaries = []
+    rows = 0
+    for name, values in _groups(df, y_col, x_col):
+        if len(values) == 0:
+            continue
+        rows += len(values)
+        q1, median, q3 = np.quantile(values, [0.25, 0.5, 0.75])
+        iqr = q3 - q1
+        inside = values[(values >= q1 - 1.5 * iqr) & (values <= q3 + 1.5 * iqr)]
+        outliers = values[(values < q1 - 1.5 * iqr) | (values > q3 + 1.5 * iqr)]
+        if len(outliers) > outlier_sample:
+            outliers = rng.choice(outliers, outlier_sample, replace=False)
+        summaries.append({
+            "name": name, "q1": q1, "median": median, "q3": q3, "mean": values.mean(),
+            "lowerfence": inside.min(), "upperfence": inside.max(), "outliers": outliers,
+        })
+    return {"groups": summaries, "rows": rows}
+
+
+# Gaussian KDE per group, evaluated on a fixed grid from a fine histogram so cost is linear in rows
+def kde_curves(df, y_col, x_col=None, points=KDE_POINTS):
+    curves = []
+    rows = 0
+    for name, values in _groups(df, y_col, x_col):
+        if len(values) == 0:
+            continue
+        rows += len(values)
+        std = values.std()
+        # Scott's rule bandwidth, with a floor so constant groups still draw
+        bandwidth = 1.06 * std * len(values) ** -0.2 if std > 0 else 1.0
+        low, high = values.min() - 3 * bandwidth, values.max() + 3 * bandwidth
+        fine_bins = points * 8
+        counts, edges = np.histogram(values, bins=fine_bins, range=(low, high))
+        step = edges[1] - edges[0]
+        half_width = min(int(np.ceil(4 * bandwidth / step)), fine_bins // 2 - 1)
+        offsets = np.arange(-half_width, half_width + 1) * step
+        kernel = np.exp(-0.5 * (offsets / bandwidth) ** 2)
+        density = np.convolve(counts, kernel, mode="same")
+        centers = (edges[:-1] + edges[1:]) / 2
+        grid = np.linspace(low, high, points)
+        density = np.interp(grid, centers, density)
+        curves.append({
+            "name": name, "grid": grid, "density": density / (density.sum() * (grid[1] - grid[0])),
+            "q1": np.quantile(values, 0.25), "median": np.median(values), "q3": np.quantile(values, 0.75),
+        })
+    return {"groups": curves, "rows": rows}
@@ -0,0 +1,165 @@
+"""Headless batch rendering of charts from a JSON spec file.
+
+Example spec:
+
+    {
+        "dataset": "data/sales.csv",
+        "output_dir": "reports/sales",
+        "formats": ["html", "png", "json"],
+        "options": {"point_budget": 5000, "downsample_method": "LTTB"},
+        "charts": [
+            {"type": "Line Chart", "name": "revenue_trend", "x": "date", "y": "revenue"},
+            {"type": "Sankey Diagram", "source": "from", "target": "to", "value": "amount"}
+        ]
+    }
+
+Every key of a chart entry other than "type" and "name" is passed to the chart builder as its column mapping.
+
+Usage: python render_batch.py spec.json [more_specs.json ...] [--workers N]
+"""
+import argparse
+import json
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from charts import CHART_REGISTRY, DEFAULT_RENDER_OPTIONS, build_chart
+from ingest import load_file
+from lazy_imports import lazy_import
+
+DEFAULT_FORMATS = ["html"]
+
+# Datasets loaded by this worker process, keyed by path
+_datasets = {}
+
+
+# Load a dataset at most once per worker process
+def get_dataset(path):
+    if path not in _datasets:
+        started = time.perf_counter()
+        with open(path, "rb") as file:
+            df, _ = load_file(file, path)
+        _datasets[path] = df, time.perf_counter() - started
+        return _datasets[path]
+    return _datasets[path][0], 0.0
+
+
+# Write a built figure in one output format; returns the path or None when the format does not apply
+def write_output(fig, chart_type, path_stem, fmt):
+    path = f"{path_stem}.{fmt}"
+    renderer = CHART_REGISTRY[chart_type]["renderer"]
+    if renderer == "folium":
+        if fmt != "html":
+            return None
+        fig.save(path)
+    elif renderer == "matplotlib":
+        if fmt != "png":
+            return None
+        fig.savefig(path, bbox_inches="tight")
+    elif fmt == "html":
+        fig.write_html(path, include_plotlyjs="cdn")
+    elif fmt == "png":
+        fig.write_image(path)
+    elif fmt == "json":
+        with open(path, "w") as file:
+            file.write(fig.to_json())
+    else:
+        raise ValueError(f"Unsupported output format: {fmt}")
+    return path
+
+
+# One-line error description for the summary table
+def format_error(error):
+    return f"{type(error).__name__}: {' '.join(str(error).split())}"
+
+
+# Build and write one chart; runs inside a worker process
+def render_job(job):
+    result = {"name": job["name"], "type": job["type"], "outputs": [], "error": None,
+              "load_seconds": 0.0, "build_seconds": 0.0, "write_seconds": 0.0}
+    try:
+        df, result["load_seconds"] = get_dataset(job["dataset"])
+
+        started = time.perf_counter()
+        fig, _ = build_chart(df, job["type"], job["params"], job["options"])
+        result["build_seconds"] = time.perf_counter() - started
+
+        # A failing format (e.g. PNG without an image export engine) does not stop the others
+        started = time.perf_counter()
+        path_stem = os.path.join(job["output_dir"], job["name"])
+        errors = []
+        for fmt in job["formats"]:
+            try:
+                path = write_output(fig, job["type"], path_stem, fmt)
+            except Exception as e:
+                errors.append(f"{fmt}: {format_error(e)}")
+                continue
+            if path:
+                result["outputs"].append(path)
+        result["write_seconds"] = time.perf_counter() - started
+        result["error"] = "; ".join(errors) or None
+
+        if CHART_REGISTRY[job["type"]]["renderer"] == "matplotlib":
+            lazy_import("matplotlib.pyplot").close(fig)
+    except Exception as e:
+        result["error"] = format_error(e)
+    return result
+
+
+# Expand a spec file into one job per chart, resolving paths relative to the spec
+def load_jobs(spec_path):
+    with open(spec_path) as file:
+        spec = json.load(file)
+    base_dir = os.path.dirname(os.path.abspath(spec_path))
+    dataset = os.path.join(base_dir, spec["dataset"])
+    output_dir = os.path.join(base_dir, spec.get("output_dir", "output"))
+    os.makedirs(output_dir, exist_ok=True)
+    options = {**DEFAULT_RENDER_OPTIONS, **spec.get("options", {})}
+    formats = spec.get("formats", DEFAULT_FORMATS)
+
+    jobs = []
+    for index, chart in enumerate(spec["charts"]):
+        chart = dict(chart)
+        chart_type = chart.pop("type")
+        name = chart.pop("name", None) or f"{index:02d}_{re.sub(r'[^a-z0-9]+', '_', chart_type.lower())}"
+        jobs.append({
+            "name": name,
+            "type": chart_type,
+            "params": chart,
+            "dataset": dataset,
+            "output_dir": output_dir,
+            "options": options,
+            "formats": formats,
+        })
+    return jobs
+
+
+# Print one line per chart plus totals
+def print_summary(results, wall_seconds):
+    print(f"{'chart':<32} {'type':<18} {'load s':>8} {'build s':>8} {'write s':>8}  status")
+    for result in results:
+        status = result["error"] or ", ".join(result["outputs"]) or "no applicable output format"
+        print(f"{result['name']:<32} {result['type']:<18} {result['load_seconds']:>8.2f} "
+              f"{result['build_seconds']:>8.2f} {result['write_seconds']:>8.2f}  {status}")
+    failed = sum(1 for result in results if result["error"])
+    print(f"{len(results)} charts, {failed} failed, {wall_seconds:.2f}s wall time")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render charts from JSON spec files without the Streamlit UI.")
+    parser.add_argument("specs", nargs="+", help="Spec files describing a dataset and the charts to render")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Number of worker processes")
+    args = parser.parse_args(argv)
+
+    jobs = [job for spec_path in args.specs for job in load_jobs(spec_path)]
+
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        results = list(executor.map(render_job, jobs))
+    print_summary(results, time.perf_counter() - started)
+    return 1 if any(result["error"] for result in results) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,85 @@
+import threading
+import time
+
+import pytest
+
+from chart_jobs import ChartJobs, JobCancelled
+
+TIMEOUT = 5
+
+
+# Stats once every job has finished; a job's done callback may still run just after its result is ready
+def settled_stats(jobs):
+    deadline = time.monotonic() + TIMEOUT
+    while jobs.stats()["active"] and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return jobs.stats()
+
+
+# Work that blocks until `release` is set, recording that it started
+def blocking_work(started, release, result="done"):
+    def work(job):
+        started.set()
+        assert release.wait(TIMEOUT)
+        job.set_stage("serializing")
+        return result
+    return work
+
+
+def test_replacing_a_queued_job_cancels_it_before_it_starts():
+    jobs = ChartJobs(max_workers=1)
+    started, release = threading.Event(), threading.Event()
+    busy = jobs.submit("other", "busy", blocking_work(started, release))
+    assert started.wait(TIMEOUT)
+
+    ran = []
+    queued = jobs.submit("slot", "old", lambda job: ran.append("old"))
+    replacement = jobs.submit("slot", "new", lambda job: "new")
+    assert queued.future.cancelled()
+
+    release.set()
+    assert busy.result(TIMEOUT) == "done"
+    assert replacement.result(TIMEOUT) == "new"
+    assert ran == []
+    assert settled_stats(jobs) == {"active": 0, "submitted": 3, "shared": 0, "cancelled": 1}
+
+
+def test_replacing_a_running_job_stops_it_at_its_next_stage():
+    jobs = ChartJobs(max_workers=1)
+    started, release = threading.Event(), threading.Event()
+    running = jobs.submit("slot", "old", blocking_work(started, release))
+    assert started.wait(TIMEOUT)
+
+    replacement = jobs.submit("slot", "new", lambda job: "new")
+    release.set()
+    with pytest.raises(JobCancelled):
+        running.result(TIMEOUT)
+    assert replacement.result(TIMEOUT) == "new"
+    assert jobs.stats()["cancelled"] == 1
+
+
+def test_slots_asking_for_the_same_spec_share_one_job():
+    jobs = ChartJobs(max_workers=1)
+    started, release = threading.Event(), threading.Event()
+    first = jobs.submit("a", "spec", blocking_work(started, release))
+    second = jobs.submit("b", "spec", blocking_work(threading.Event(), release, result="unused"))
+    assert second is first
+    assert first.slots == {"a", "b"}
+
+    # The job keeps running while another slot still waits for it
+    jobs.submit("a", "elsewhere", lambda job: None)
+    assert not first.cancel_event.is_set()
+    release.set()
+    assert first.result(TIMEOUT) == "done"
+    assert settled_stats(jobs) == {"active": 0, "submitted": 2, "shared": 1, "cancelled": 0}
+
+
+def test_resubmitting_the_same_spec_for_a_slot_keeps_its_job():
+    jobs = ChartJobs(max_workers=1)
+    started, release = threading.Event(), threading.Event()
+    job = jobs.submit("slot", "spec", blocking_work(started, release))
+    assert jobs.submit("slot", "spec", blocking_work(started, release)) is job
+    release.set()
+    assert job.result(TIMEOUT) == "done"
+    assert job.progress() == 1.0
+    assert settled_stats(jobs) == {"active": 0, "submitted": 1, "shared": 0, "cancelled": 0}
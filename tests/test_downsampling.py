@@ -0,0 +1,82 @@
+import numpy as np
+import pandas as pd
+
+from downsampling import density_sample_indices, downsample_points, downsample_series, lttb_indices, minmax_indices
+
+N = 10_000
+
+
+def noisy_series(seed=0):
+    rng = np.random.default_rng(seed)
+    x = np.arange(N, dtype="float64")
+    y = np.sin(x / 500) + rng.normal(scale=0.1, size=N)
+    # One spike each way, which any shape-preserving method must keep
+    y[1234], y[6789] = 50.0, -50.0
+    return x, y
+
+
+def assert_valid_selection(keep, n, budget):
+    assert len(keep) <= budget
+    assert np.all(np.diff(keep) > 0)
+    assert keep[0] >= 0 and keep[-1] < n
+
+
+def test_lttb_keeps_the_budget_the_ends_and_the_spikes():
+    x, y = noisy_series()
+    keep = lttb_indices(x, y, 500)
+    assert_valid_selection(keep, N, 500)
+    assert keep[0] == 0 and keep[-1] == N - 1
+    assert {1234, 6789} <= set(keep)
+
+
+def test_minmax_keeps_the_budget_the_ends_and_the_spikes():
+    x, y = noisy_series()
+    keep = minmax_indices(x, y, 500)
+    assert_valid_selection(keep, N, 500)
+    assert keep[0] == 0 and keep[-1] == N - 1
+    assert {1234, 6789} <= set(keep)
+
+
+def test_small_inputs_are_kept_whole():
+    x, y = noisy_series()
+    for method in (lttb_indices, minmax_indices, density_sample_indices):
+        assert method(x[:100], y[:100], 500).tolist() == list(range(100))
+
+
+def test_density_sampling_keeps_the_budget_and_sparse_outliers():
+    rng = np.random.default_rng(0)
+    x = np.concatenate([rng.normal(size=N), [40.0]])
+    y = np.concatenate([rng.normal(size=N), [-40.0]])
+    keep = density_sample_indices(x, y, 1000)
+    assert_valid_selection(keep, N + 1, 1000)
+    assert N in keep
+    assert keep.tolist() == density_sample_indices(x, y, 1000).tolist()
+
+
+def test_density_sampling_when_cells_outnumber_the_budget():
+    rng = np.random.default_rng(1)
+    x, y = rng.uniform(size=N), rng.uniform(size=N)
+    keep = density_sample_indices(x, y, 50)
+    assert_valid_selection(keep, N, 50)
+
+
+def test_downsample_series_sorts_by_x_and_drops_missing_values():
+    x, y = noisy_series()
+    df = pd.DataFrame({"x": x, "y": y}).sample(frac=1, random_state=0)
+    df.loc[df.index[:10], "y"] = np.nan
+    for method in ("LTTB", "Min/Max (M4)"):
+        plot_df, total = downsample_series(df, "x", "y", 400, method)
+        assert total == N
+        assert len(plot_df) <= 400
+        assert plot_df["x"].is_monotonic_increasing
+        assert plot_df["y"].notna().all()
+    assert downsample_series(df, "x", "y", 400, "None")[0] is df
+
+
+def test_downsample_points_with_a_text_axis():
+    rng = np.random.default_rng(2)
+    df = pd.DataFrame({"x": rng.choice(list("abcdef"), N), "y": rng.normal(size=N)})
+    plot_df, total = downsample_points(df, "x", "y", 300)
+    assert total == N
+    assert len(plot_df) <= 300
+    assert set(plot_df["x"]) == set("abcdef")
@@ -0,0 +1,77 @@
+import functools
+import io
+
+import openpyxl
+import pandas as pd
+
+import ingest
+from dataset_cache import load_cached_frame, store_cached_frame
+from ingest import load_file, read_csv_optimized
+
+# Small chunks put every case below across several chunks
+CHUNK_ROWS = 4
+
+
+def read(text, chunk_rows=CHUNK_ROWS):
+    df, _ = read_csv_optimized(io.BytesIO(text.encode()), chunk_rows=chunk_rows)
+    return df
+
+
+def roundtrip(df, tmp_path):
+    store_cached_frame("frame", df, str(tmp_path))
+    return load_cached_frame("frame", str(tmp_path))
+
+
+def test_frame_arrow_cannot_store_still_loads(tmp_path, monkeypatch):
+    monkeypatch.setattr(ingest, "store_cached_frame", functools.partial(store_cached_frame, cache_dir=str(tmp_path)))
+    monkeypatch.setattr(ingest, "load_cached_frame", functools.partial(load_cached_frame, cache_dir=str(tmp_path)))
+    workbook = openpyxl.Workbook()
+    workbook.active.append(["id", "v"])
+    for i in range(200):
+        workbook.active.append(["abc" if i == 2 else i, i])
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+
+    df, stats = load_file(buffer, "mixed.xlsx")
+    assert df["id"].tolist()[:4] == [0, 1, "abc", 3]
+    assert stats["source"] == "parse"
+    assert not store_cached_frame("mixed", df, str(tmp_path))
+    assert load_cached_frame("mixed", str(tmp_path)) is None
+
+
+def test_category_column_empty_for_a_whole_chunk(tmp_path):
+    df = read("k,cat\n1,a\n2,b\n3,a\n4,b\n5,\n6,\n7,\n8,\n9,a\n")
+    assert isinstance(df["cat"].dtype, pd.CategoricalDtype)
+    assert df["cat"].isna().tolist() == [False] * 4 + [True] * 4 + [False]
+    assert df["cat"].dtype == read("k,cat\n1,a\n2,b\n3,a\n4,b\n5,\n6,\n7,\n8,\n9,a\n", chunk_rows=100)["cat"].dtype
+    assert roundtrip(df, tmp_path)["cat"].astype(object).fillna("").tolist() == ["a", "b", "a", "b", "", "", "", "", "a"]
+
+
+def test_category_column_with_new_values_in_later_chunks():
+    df = read("k,cat\n1,a\n2,b\n3,a\n4,b\n5,c\n6,c\n7,d\n8,d\n")
+    assert list(df["cat"].cat.categories) == ["a", "b", "c", "d"]
+    assert df["cat"].tolist() == ["a", "b", "a", "b", "c", "c", "d", "d"]
+
+
+def test_text_column_that_looks_numeric_in_a_later_chunk():
+    df = read("k,code\n1,a1\n2,b2\n3,c3\n4,d4\n5,007\n6,042\n")
+    assert df["code"].tolist() == ["a1", "b2", "c3", "d4", "007", "042"]
+
+
+def test_numeric_column_with_text_in_a_later_chunk(tmp_path):
+    df = read("k,v\n1,1\n2,2\n3,3\n4,4\n5,foo\n6,7\n")
+    assert df["v"].tolist() == ["1", "2", "3", "4", "foo", "7"]
+    assert roundtrip(df, tmp_path)["v"].tolist() == ["1", "2", "3", "4", "foo", "7"]
+
+
+def test_date_column_in_another_format_later_stays_text():
+    df = read("k,d\n1,2024-01-01\n2,2024-01-02\n3,2024-01-03\n4,2024-01-04\n5,01/05/2024\n")
+    assert df["d"].tolist() == ["2024-01-01", "2024-01-02", "2024-01-03", "2024-01-04", "01/05/2024"]
+
+
+def test_consistent_file_keeps_optimized_dtypes():
+    df = read("d,x,cat\n" + "".join(f"2024-01-0{i % 9 + 1},{i},{'ab'[i % 2]}\n" for i in range(10)))
+    assert pd.api.types.is_datetime64_any_dtype(df["d"])
+    assert df["x"].dtype == "int8"
+    assert isinstance(df["cat"].dtype, pd.CategoricalDtype)
+    assert len(df) == 10
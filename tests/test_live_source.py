@@ -0,0 +1,85 @@
+import pandas as pd
+
+from charts import DEFAULT_RENDER_OPTIONS, build_live_histogram, build_live_line
+from incremental import GroupSum
+from live_source import LiveSource
+
+
+def append(path, text):
+    with open(path, "a") as handle:
+        handle.write(text)
+
+
+def test_appended_rows_are_read_incrementally(tmp_path):
+    path = tmp_path / "data.csv"
+    path.write_text("cat,value\na,1\nb,2\n")
+    source = LiveSource(str(path))
+    assert source.poll() == 2
+    totals = source.aggregate("sum", lambda: GroupSum(["cat"], "value"))
+    assert totals["rows"] == 2
+
+    append(path, "a,3\nb,")
+    # The partly written last line waits for the next poll
+    assert source.poll() == 1
+    append(path, "4\n")
+    assert source.poll() == 1
+    totals = source.aggregate("sum", lambda: GroupSum(["cat"], "value"))
+    assert dict(zip(totals["frame"]["cat"], totals["frame"]["value"])) == {"a": 4, "b": 6}
+    assert source.frame()["value"].tolist() == [1, 2, 3, 4]
+
+
+def test_appended_rows_with_missing_values(tmp_path):
+    path = tmp_path / "data.csv"
+    path.write_text("cat,value,when\na,1,2024-01-01\nb,2,2024-01-02\na,3,2024-01-03\nb,4,2024-01-04\n")
+    source = LiveSource(str(path))
+    source.poll()
+    append(path, ",5,\n")
+    assert source.poll() == 1
+    append(path, "b,,2024-01-05\n")
+    source.poll()
+    frame = source.frame()
+    assert isinstance(frame["cat"].dtype, pd.CategoricalDtype)
+    assert frame["cat"].isna().tolist() == [False, False, False, False, True, False]
+    assert frame["value"].isna().tolist() == [False, False, False, False, False, True]
+    assert pd.api.types.is_datetime64_any_dtype(frame["when"])
+    # Chunks are merged in place, so the next call works from the merged frame
+    append(path, "c,6,2024-01-06\n")
+    source.poll()
+    assert source.frame()["cat"].tolist()[-1] == "c"
+
+
+def test_appended_rows_that_do_not_fit_the_first_dtypes_become_text(tmp_path):
+    path = tmp_path / "data.csv"
+    path.write_text("code,when\n1,2024-01-01\n2,2024-01-02\n")
+    source = LiveSource(str(path))
+    source.poll()
+    append(path, "x7,01/03/2024\n")
+    assert source.poll() == 3
+    frame = source.frame()
+    assert frame["code"].tolist() == ["1", "2", "x7"]
+    assert frame["when"].tolist() == ["2024-01-01", "2024-01-02", "01/03/2024"]
+    assert source.text_fallbacks == ["code", "when"]
+
+
+def test_header_written_before_any_rows_does_not_fix_the_dtypes(tmp_path):
+    path = tmp_path / "data.csv"
+    path.write_text("ts,value,cat\n")
+    source = LiveSource(str(path))
+    assert source.poll() == 0
+    append(path, "".join(f"2024-01-01 00:{i // 60:02d}:{i % 60:02d},{i % 50},{'abc'[i % 3]}\n" for i in range(100)))
+    assert source.poll() == 100
+    fresh = LiveSource(str(path))
+    fresh.poll()
+    assert source.dtypes.to_dict() == fresh.dtypes.to_dict()
+    assert pd.api.types.is_datetime64_any_dtype(source.dtypes["ts"])
+    assert source.dtypes["value"] == "int8"
+    assert isinstance(source.dtypes["cat"], pd.CategoricalDtype)
+
+
+def test_live_charts_on_a_header_only_file(tmp_path):
+    path = tmp_path / "data.csv"
+    path.write_text("ts,value\n")
+    source = LiveSource(str(path))
+    source.poll()
+    build_live_line(source, {"x": "ts", "y": "value"}, DEFAULT_RENDER_OPTIONS)
+    build_live_histogram(source, {"x": "value"}, DEFAULT_RENDER_OPTIONS)
@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+
+from preaggregate import HEATMAP_BINS, MAX_AUTO_BINS, heatmap_grid, histogram_bins
+
+ROWS = 5_000
+
+
+def frame():
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        "when": pd.date_range("2024-01-01", periods=ROWS, freq="h"),
+        "value": rng.normal(size=ROWS),
+        "group": pd.Categorical(rng.choice(list("abc"), ROWS)),
+        "id": [f"id{i}" for i in range(ROWS)],
+        "other_id": [f"other{i}" for i in rng.permutation(ROWS)],
+    })
+
+
+def test_heatmap_grid_bins_datetime_and_caps_text_axes():
+    df = frame()
+    for x, y in [("group", "when"), ("id", "other_id"), ("value", "when")]:
+        grid = heatmap_grid(df, x, y, "value")
+        assert grid["z"].shape[0] <= HEATMAP_BINS and grid["z"].shape[1] <= HEATMAP_BINS
+        assert grid["rows"] == ROWS
+        assert np.isclose(np.nansum(grid["z"]), df["value"].sum())
+    assert "Other" in heatmap_grid(df, "id", "group", "value")["x"]
+    assert all(isinstance(key, pd.Timestamp) for key in heatmap_grid(df, "group", "when", "value")["y"])
+
+
+def test_histogram_of_text_counts_each_value():
+    df = frame()
+    hist = histogram_bins(df["group"])
+    assert sorted(hist["categories"]) == ["a", "b", "c"]
+    assert hist["counts"].sum() == ROWS
+    hist = histogram_bins(df["id"])
+    assert len(hist["categories"]) == MAX_AUTO_BINS and hist["categories"][-1] == "Other"
+    assert hist["counts"].sum() == ROWS
+
+
+def test_histogram_of_datetimes_keeps_nanosecond_edges():
+    df = frame()
+    hist = histogram_bins(df["when"], bins=10)
+    assert hist["datetime"] and hist["counts"].sum() == ROWS
+    assert pd.Timestamp(int(hist["edges"][0])) == df["when"].min()
+    assert pd.Timestamp(int(hist["edges"][-1])) == df["when"].max()
@@ -0,0 +1,22 @@
+import pandas as pd
+from wordcloud import WordCloud
+
+from word_freq import word_frequencies
+
+CORPUS = [
+    "In 2024 the cats sold 100 units",
+    "The Cat sat on 100 mats",
+    "Dogs dogs dogs and a dog",
+    "cat's toy, 2024 Dogs",
+    "Grass and glass; X marks the spot",
+]
+
+
+def test_matches_wordcloud_process_text():
+    expected = WordCloud().process_text(" ".join(CORPUS))
+    assert dict(word_frequencies(pd.Series(CORPUS))) == expected
+
+
+def test_chunks_are_merged_before_normalizing():
+    expected = WordCloud().process_text(" ".join(CORPUS))
+    assert dict(word_frequencies(pd.Series(CORPUS + [None]), chunk_rows=2)) == expected
@@ -0,0 +1,149 @@
+import io
+import zipfile
+
+import pandas as pd
+
+from xlsx_reader import read_xlsx
+
+CONTENT_TYPES = """<?xml version="1.0" encoding="UTF-8"?>
+<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">
+<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>
+<Default Extension="xml" ContentType="application/xml"/>
+<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>
+<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>
+<Override PartName="/xl/styles.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>
+<Override PartName="/xl/sharedStrings.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sharedStrings+xml"/>
+</Types>"""
+
+PACKAGE_RELS = """<?xml version="1.0" encoding="UTF-8"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>
+</Relationships>"""
+
+WORKBOOK = """<?xml version="1.0" encoding="UTF-8"?>
+<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">
+<workbookPr date1904="{date1904}"/>
+<sheets><sheet name="Sheet1" sheetId="1" r:id="rId1"/></sheets>
+</workbook>"""
+
+WORKBOOK_RELS = """<?xml version="1.0" encoding="UTF-8"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" Target="worksheets/sheet1.xml"/>
+<Relationship Id="rId2" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" Target="styles.xml"/>
+<Relationship Id="rId3" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/sharedStrings" Target="sharedStrings.xml"/>
+</Relationships>"""
+
+# Style 1 shows a date; style 2 only fills the cell, as formatting empty rows does
+STYLES = """<?xml version="1.0" encoding="UTF-8"?>
+<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">
+<fonts count="1"><font/></fonts>
+<fills count="3"><fill><patternFill patternType="none"/></fill><fill><patternFill patternType="gray125"/></fill>
+<fill><patternFill patternType="solid"><fgColor rgb="FFFFFF00"/></patternFill></fill></fills>
+<borders count="1"><border/></borders>
+<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>
+<cellXfs count="3"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>
+<xf numFmtId="14" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>
+<xf numFmtId="0" fontId="0" fillId="2" borderId="0" xfId="0" applyFill="1"/></cellXfs>
+<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>
+</styleSheet>"""
+
+SHEET = """<?xml version="1.0" encoding="UTF-8"?>
+<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>{rows}</sheetData></worksheet>"""
+
+SHARED_STRINGS = """<?xml version="1.0" encoding="UTF-8"?>
+<sst xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">{items}</sst>"""
+
+
+# Minimal workbook whose one sheet holds `rows`, a list of rows of raw <c> elements
+def workbook(rows, strings=(), date1904=False):
+    row_xml = "".join(f'<row r="{number}">{"".join(cells)}</row>' for number, cells in enumerate(rows, start=1))
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.writestr("[Content_Types].xml", CONTENT_TYPES)
+        archive.writestr("_rels/.rels", PACKAGE_RELS)
+        archive.writestr("xl/workbook.xml", WORKBOOK.format(date1904=int(date1904)))
+        archive.writestr("xl/_rels/workbook.xml.rels", WORKBOOK_RELS)
+        archive.writestr("xl/styles.xml", STYLES)
+        archive.writestr("xl/sharedStrings.xml", SHARED_STRINGS.format(items="".join(f"<si><t>{s}</t></si>" for s in strings)))
+        archive.writestr("xl/worksheets/sheet1.xml", SHEET.format(rows=row_xml))
+    return buffer
+
+
+def header(*names):
+    return [f'<c r="{chr(65 + i)}1" t="inlineStr"><is><t>{name}</t></is></c>' for i, name in enumerate(names)]
+
+
+def number(ref, value, style=0):
+    return f'<c r="{ref}" s="{style}"><v>{value}</v></c>'
+
+
+def assert_matches_pandas(buffer):
+    expected = pd.read_excel(buffer, engine="openpyxl")
+    actual = read_xlsx(buffer)
+    pd.testing.assert_frame_equal(actual, expected, check_dtype=False)
+    return actual
+
+
+def test_dates_and_numbers():
+    rows = [header("d", "x"), [number("A2", 45292, 1), number("B2", 1)], [number("A3", 45293.5, 1), number("B3", 2.5)]]
+    df = assert_matches_pandas(workbook(rows))
+    assert df["d"].tolist() == [pd.Timestamp("2024-01-01"), pd.Timestamp("2024-01-02 12:00")]
+
+
+def test_1904_workbook_dates():
+    rows = [header("d"), [number("A2", 43830, 1)]]
+    df = assert_matches_pandas(workbook(rows, date1904=True))
+    assert df["d"].tolist() == [pd.Timestamp("2024-01-01")]
+
+
+def test_shared_and_inline_strings():
+    rows = [
+        header("s"),
+        ['<c r="A2" t="s"><v>0</v></c>'],
+        ['<c r="A3" t="inlineStr"><is><r><t>in</t></r><r><t>line</t></r></is></c>'],
+    ]
+    df = assert_matches_pandas(workbook(rows, strings=["shared"]))
+    assert df["s"].tolist() == ["shared", "inline"]
+
+
+def test_booleans():
+    rows = [header("b"), ['<c r="A2" t="b"><v>1</v></c>'], ['<c r="A3" t="b"><v>0</v></c>']]
+    df = assert_matches_pandas(workbook(rows))
+    assert df["b"].tolist() == [True, False]
+
+
+def test_error_cells_read_as_missing():
+    rows = [header("x"), [number("A2", 1)], ['<c r="A3" t="e"><v>#DIV/0!</v></c>'], [number("A4", 3)]]
+    df = assert_matches_pandas(workbook(rows))
+    assert df["x"].isna().tolist() == [False, True, False]
+
+
+def test_formula_without_cached_value_reads_as_missing():
+    rows = [header("x", "y"), [number("A2", 1), '<c r="B2"><f>A2*2</f></c>'], [number("A3", 2), '<c r="B3"><f>A3*2</f><v>4</v></c>']]
+    df = assert_matches_pandas(workbook(rows))
+    assert df["y"].isna().tolist() == [True, False]
+
+
+def test_cells_beyond_the_header_get_unnamed_columns():
+    rows = [header("a"), [number("A2", 1), number("C2", 3)], [number("A3", 2)]]
+    df = assert_matches_pandas(workbook(rows))
+    assert list(df.columns) == ["a", "Unnamed: 1", "Unnamed: 2"]
+
+
+def test_trailing_styled_empty_rows_are_dropped():
+    rows = [header("a"), [number("A2", 1)], [], [number("A4", 2)], ['<c r="A5" s="2"/>'], ['<c r="A6" s="2"/>']]
+    df = assert_matches_pandas(workbook(rows))
+    assert len(df) == 3
+
+
+def test_pandas_na_strings_read_as_missing():
+    rows = [
+        header("s", "x"),
+        ['<c r="A2" t="inlineStr"><is><t>NA</t></is></c>', number("B2", 1)],
+        ['<c r="A3" t="s"><v>0</v></c>', '<c r="B3" t="s"><v>1</v></c>'],
+        ['<c r="A4" t="s"><v>1</v></c>', number("B4", 3)],
+        ['<c r="A5" t="inlineStr"><is><t></t></is></c>', '<c r="B5" t="str"><v>#N/A</v></c>'],
+    ]
+    df = assert_matches_pandas(workbook(rows, strings=["ok", "N/A"]))
+    assert df["s"].isna().tolist() == [True, False, True, True]
+    assert df["x"].dtype == "float64"
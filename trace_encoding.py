@@ -0,0 +1,59 @@
+import base64
+import json
+import re
+
+import numpy as np
+
+# Point traces with more points than this are drawn with WebGL instead of SVG; 0 never switches
+DEFAULT_WEBGL_THRESHOLD = 1000
+
+
+# Plotly Express render_mode for a trace of `points` points
+def render_mode(points, threshold=DEFAULT_WEBGL_THRESHOLD):
+    return "webgl" if threshold and points > threshold else "svg"
+
+
+# Replace datetime x/y arrays with epoch milliseconds on a date axis, so Plotly ships them as typed arrays
+# instead of one ISO string per point
+def encode_date_arrays(fig):
+    for trace in fig.data:
+        for axis in ("x", "y"):
+            values = trace[axis]
+            if not isinstance(values, np.ndarray) or not np.issubdtype(values.dtype, np.datetime64):
+                continue
+            millis = values.astype("datetime64[ms]").astype("int64").astype("float64")
+            millis[np.isnat(values)] = np.nan
+            trace[axis] = millis
+            # Traces name their axes "x", "x2", ...; the layout calls them "xaxis", "xaxis2", ...
+            fig.update_layout({f"{axis}axis{(trace[axis + 'axis'] or axis)[1:]}": {"type": "date"}})
+    return fig
+
+
+# Typed arrays as plotly.io writes them: {"dtype": ..., "bdata": ..., optional "shape": ...}
+TYPED_ARRAY_PATTERN = re.compile(r'\{"dtype":"(\w+)","bdata":"([^"]*)"(?:,"shape":"[^"]*")?\}')
+TEXT_SAMPLE = 1000
+
+
+# Estimated size of `values` written out as a JSON number list, from an evenly spaced sample
+def _text_array_bytes(values):
+    if len(values) == 0:
+        return 2
+    sample = values[::max(1, len(values) // TEXT_SAMPLE)]
+    per_value = (len(json.dumps(sample.tolist(), separators=(",", ":"))) - 2) / len(sample)
+    return int(per_value * len(values)) + 2
+
+
+# Serialized size of a figure, and its estimated size with every typed array written out as a JSON number list,
+# or None for the latter when the figure carries no typed arrays
+def payload_sizes(figure_json):
+    binary_bytes = len(figure_json.encode())
+    matches = list(TYPED_ARRAY_PATTERN.finditer(figure_json))
+    if not matches:
+        return binary_bytes, None
+    text_bytes = binary_bytes
+    for match in matches:
+        # plotly.io escapes "/" inside strings as \u002f
+        bdata = match.group(2).replace("\\u002f", "/")
+        values = np.frombuffer(base64.b64decode(bdata), dtype=match.group(1))
+        text_bytes += _text_array_bytes(values) - len(match.group(0))
+    return binary_bytes, text_bytes
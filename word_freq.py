@@ -0,0 +1,72 @@
+import multiprocessing
+import os
+import re
+from collections import Counter, defaultdict
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from operator import itemgetter
+
+from wordcloud import STOPWORDS
+
+# Same token pattern WordCloud uses by default
+TOKEN_PATTERN = re.compile(r"\w[\w']*")
+TEXT_CHUNK_ROWS = 50_000
+# Corpora smaller than this are tokenized in-process; worker start-up would cost more than it saves
+PARALLEL_MIN_ROWS = 500_000
+
+
+# Count tokens in one chunk of text values, filtering each distinct token only once. Tokens keep their case
+# and filter as WordCloud().process_text does: "'s" is stripped, numbers and stopwords are dropped.
+def count_chunk(texts):
+    raw = Counter(TOKEN_PATTERN.findall(" ".join(texts)))
+    counts = Counter()
+    for token, count in raw.items():
+        if token.lower().endswith("'s"):
+            token = token[:-2]
+        if not token.isdigit() and token.lower() not in STOPWORDS:
+            counts[token] += count
+    return counts
+
+
+# WordCloud's case and plural normalization (wordcloud.tokenization.process_tokens) applied to merged counts,
+# so it runs once over the vocabulary instead of over every token: a word ending in "s" merges into its
+# singular when both occur, and each word is keyed by its most frequent capitalization.
+def normalize_counts(counts):
+    cases = defaultdict(dict)
+    for token, count in counts.items():
+        cases[token.lower()][token] = count
+    for key in list(cases):
+        if key.endswith("s") and not key.endswith("ss") and key[:-1] in cases:
+            singular = cases[key[:-1]]
+            for token, count in cases.pop(key).items():
+                singular[token[:-1]] = singular.get(token[:-1], 0) + count
+    return Counter({max(forms.items(), key=itemgetter(1))[0]: sum(forms.values()) for forms in cases.values()})
+
+
+# Split a text column into lists of strings, one chunk at a time
+def iter_text_chunks(series, chunk_rows=TEXT_CHUNK_ROWS):
+    for start in range(0, len(series), chunk_rows):
+        yield series.iloc[start:start + chunk_rows].dropna().astype(str).tolist()
+
+
+# Build term counts chunk by chunk, matching WordCloud().process_text without collocations, fanning out to a process pool for large corpora
+def word_frequencies(series, workers=None, chunk_rows=TEXT_CHUNK_ROWS):
+    counts = Counter()
+    chunks = iter_text_chunks(series, chunk_rows)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(series) < PARALLEL_MIN_ROWS:
+        for chunk in chunks:
+            counts.update(count_chunk(chunk))
+        return normalize_counts(counts)
+
+    # Keep only a few chunks in flight so the corpus is never copied into the pool all at once
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+        pending = set()
+        for chunk in chunks:
+            pending.add(executor.submit(count_chunk, chunk))
+            if len(pending) >= 2 * workers:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    counts.update(future.result())
+        for future in pending:
+            counts.update(future.result())
+    return normalize_counts(counts)
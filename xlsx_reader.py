@@ -0,0 +1,306 @@
+import functools
+import posixpath
+import zipfile
+import xml.etree.ElementTree as ET
+
+import numpy as np
+import pandas as pd
+from pandas._libs.parsers import STR_NA_VALUES
+
+from lazy_imports import lazy_import
+
+# Only report progress when it has moved by at least this fraction
+PROGRESS_STEP = 0.01
+DIGITS = "0123456789"
+EPOCH_1900 = pd.Timestamp("1899-12-30")
+EPOCH_1904 = pd.Timestamp("1904-01-01")
+# Text pd.read_excel reads as missing by default ("", "NA", "N/A", "NULL", "#N/A", "nan", ...)
+NA_STRINGS = np.array(sorted(STR_NA_VALUES), dtype=object)
+
+
+# Both helpers see the same few strings millions of times, so their results are memoized
+@functools.lru_cache(maxsize=None)
+def _local(tag):
+    return tag.rsplit("}", 1)[-1]
+
+
+@functools.lru_cache(maxsize=None)
+def _column_index(letters):
+    index = 0
+    for letter in letters:
+        index = index * 26 + ord(letter) - 64
+    return index - 1
+
+
+# Text of a shared or inline string item, skipping phonetic runs
+def _string_item(element):
+    parts = []
+    for child in element:
+        name = _local(child.tag)
+        if name == "t":
+            parts.append(child.text or "")
+        elif name == "r":
+            parts.extend(t.text or "" for t in child if _local(t.tag) == "t")
+    return "".join(parts)
+
+
+# Sheet name -> worksheet member path, and whether the workbook counts dates from 1904
+def _workbook_sheets(archive):
+    rels = ET.fromstring(archive.read("xl/_rels/workbook.xml.rels"))
+    targets = {rel.get("Id"): rel.get("Target") for rel in rels}
+    sheets = {}
+    date1904 = False
+    for element in ET.fromstring(archive.read("xl/workbook.xml")).iter():
+        name = _local(element.tag)
+        if name == "workbookPr":
+            date1904 = element.get("date1904") in ("1", "true")
+        elif name == "sheet":
+            rel_id = next(value for key, value in element.attrib.items() if _local(key) == "id")
+            target = targets[rel_id]
+            sheets[element.get("name")] = target.lstrip("/") if target.startswith("/") else posixpath.normpath(posixpath.join("xl", target))
+    return sheets, date1904
+
+
+def _shared_strings(archive):
+    if "xl/sharedStrings.xml" not in archive.namelist():
+        return np.array([], dtype=object)
+    strings = []
+    with archive.open("xl/sharedStrings.xml") as source:
+        for _, element in ET.iterparse(source):
+            if _local(element.tag) == "si":
+                strings.append(_string_item(element))
+                element.clear()
+    return np.array(strings, dtype=object)
+
+
+# Style indexes whose number format displays a date
+def _date_styles(archive):
+    if "xl/styles.xml" not in archive.namelist():
+        return np.array([], dtype="int64")
+    # openpyxl's format tables cost a noticeable share of cold start, so they load on first use
+    numbers = lazy_import("openpyxl.styles.numbers")
+    styles = ET.fromstring(archive.read("xl/styles.xml"))
+    formats = dict(numbers.BUILTIN_FORMATS)
+    for element in styles.iter():
+        if _local(element.tag) == "numFmt":
+            formats[int(element.get("numFmtId"))] = element.get("formatCode")
+    date_styles = []
+    for element in styles:
+        if _local(element.tag) != "cellXfs":
+            continue
+        for index, xf in enumerate(element):
+            code = formats.get(int(xf.get("numFmtId", 0)))
+            # Durations stay numeric (fractions of a day) rather than turning into dates
+            if code and numbers.is_date_format(code) and not numbers.is_timedelta_format(code):
+                date_styles.append(index)
+    return np.array(date_styles, dtype="int64")
+
+
+# File-like wrapper that reports the fraction of a stream read so far
+class _ProgressReader:
+    def __init__(self, source, total, callback):
+        self.source = source
+        self.total = max(total, 1)
+        self.callback = callback
+        self.done = 0
+        self.reported = 0.0
+
+    def read(self, size=-1):
+        data = self.source.read(size)
+        self.done += len(data)
+        fraction = min(self.done / self.total, 1.0)
+        if fraction - self.reported >= PROGRESS_STEP:
+            self.reported = fraction
+            self.callback(fraction)
+        return data
+
+
+# Rows of a worksheet as (row number, cells, filled), each cell a (column index, type, style, value text)
+# and `filled` whether any cell of the row holds a value. The first row is always read whole; later rows
+# keep only the columns in `wanted`, which the caller may fill in after seeing the header. None keeps
+# every column.
+def _iter_rows(source, wanted=None):
+    row_number = 0
+    first = True
+    for _, element in ET.iterparse(source):
+        if _local(element.tag) != "row":
+            continue
+        row_number = int(element.get("r", row_number + 1))
+        cells = []
+        filled = False
+        column = -1
+        for cell in element:
+            ref = cell.get("r")
+            column = _column_index(ref.rstrip(DIGITS)) if ref else column + 1
+            # Unused columns are skipped before any value is decoded
+            if not first and wanted is not None and column not in wanted:
+                filled = filled or any(_local(child.tag) in ("v", "is") for child in cell)
+                continue
+            cell_type = cell.get("t", "n")
+            text = None
+            for child in cell:
+                name = _local(child.tag)
+                if name == "v":
+                    text = child.text
+                elif name == "is":
+                    text = _string_item(child)
+            if text is not None:
+                cells.append((column, cell_type, int(cell.get("s", 0)), text))
+        element.clear()
+        first = False
+        yield row_number, cells, filled or bool(cells)
+
+
+def _header_names(cells, shared_strings):
+    names = {}
+    for column, cell_type, _, text in cells:
+        if cell_type == "s":
+            text = shared_strings[int(text)]
+        elif cell_type == "n":
+            number = float(text)
+            text = str(int(number)) if number.is_integer() else text
+        names[column] = text
+    if not names:
+        return []
+    header = [names.get(i, f"Unnamed: {i}") for i in range(max(names) + 1)]
+    # Repeated names get ".1", ".2", ... suffixes, as pandas does
+    seen = {}
+    for i, name in enumerate(header):
+        if name in seen:
+            seen[name] += 1
+            header[i] = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+    return header
+
+
+def _open_sheet(archive, sheets, sheet):
+    if sheet is None:
+        sheet = next(iter(sheets))
+    if sheet not in sheets:
+        raise ValueError(f"Worksheet {sheet!r} not found")
+    return sheet, sheets[sheet]
+
+
+# Column names of every worksheet, read from each sheet's first row without parsing the rest
+def sheet_headers(file):
+    file.seek(0)
+    with zipfile.ZipFile(file) as archive:
+        sheets, _ = _workbook_sheets(archive)
+        shared_strings = _shared_strings(archive)
+        headers = {}
+        for name, path in sheets.items():
+            with archive.open(path) as source:
+                first = next(_iter_rows(source), None)
+            headers[name] = _header_names(first[1], shared_strings) if first else []
+    file.seek(0)
+    return headers
+
+
+# Whole numbers come back as integers, as openpyxl returns them
+def _as_integers(values):
+    if len(values) and np.all(np.isfinite(values)) and np.all(values == np.round(values)) and np.abs(values).max() < 2 ** 53:
+        return values.astype("int64")
+    return values
+
+
+# Excel date serials (days since the epoch), rounded to milliseconds like openpyxl
+def _serial_dates(texts, epoch):
+    return (epoch + pd.to_timedelta(texts.astype("float64"), unit="D")).round("ms")
+
+
+# One column from its cells, vectorized per cell type; all-number and all-date columns get native dtypes
+def _column_values(rows, types, styles, texts, n_rows, shared_strings, date_styles, epoch):
+    rows = np.asarray(rows, dtype="int64")
+    types = np.asarray(types)
+    styles = np.asarray(styles, dtype="int64")
+    texts = np.asarray(texts, dtype=object)
+    shared = types == "s"
+    if shared.any():
+        texts[shared] = shared_strings[texts[shared].astype("int64")]
+        types = np.where(shared, "str", types)
+    strings = (types == "str") | (types == "inlineStr")
+    # Error cells and pandas' default NA strings read as missing, as pd.read_excel reads them, so they do
+    # not decide the dtype
+    valid = (types != "e") & ~(strings & np.isin(texts, NA_STRINGS))
+    if not valid.all():
+        rows, types, styles, texts, strings = rows[valid], types[valid], styles[valid], texts[valid], strings[valid]
+    numeric = types == "n"
+    dates = numeric & np.isin(styles, date_styles)
+    numeric &= ~dates
+
+    complete = len(rows) == n_rows
+    if numeric.all():
+        values = texts.astype("float64")
+        if complete:
+            return _as_integers(values)
+        column = np.full(n_rows, np.nan)
+        column[rows] = values
+        return column
+    if dates.all():
+        column = np.full(n_rows, np.datetime64("NaT"), dtype="datetime64[ns]")
+        column[rows] = _serial_dates(texts, epoch).to_numpy()
+        return column
+    if complete and (types == "b").all():
+        return texts == "1"
+
+    column = np.full(n_rows, None, dtype=object)
+    column[rows[numeric]] = _as_integers(texts[numeric].astype("float64"))
+    column[rows[dates]] = list(_serial_dates(texts[dates], epoch))
+    column[rows[strings]] = texts[strings]
+    iso_dates = types == "d"
+    column[rows[iso_dates]] = list(pd.to_datetime(texts[iso_dates]))
+    booleans = types == "b"
+    column[rows[booleans]] = texts[booleans] == "1"
+    return column
+
+
+# Stream one worksheet into a DataFrame, decoding only the requested columns
+def read_xlsx(file, sheet=None, columns=None, progress=None):
+    file.seek(0)
+    with zipfile.ZipFile(file) as archive:
+        sheets, date1904 = _workbook_sheets(archive)
+        sheet, path = _open_sheet(archive, sheets, sheet)
+        shared_strings = _shared_strings(archive)
+        date_styles = _date_styles(archive)
+        epoch = EPOCH_1904 if date1904 else EPOCH_1900
+
+        with archive.open(path) as source:
+            if progress is not None:
+                source = _ProgressReader(source, archive.getinfo(path).file_size, progress)
+            # Without a column selection every cell is kept, including any beyond the header
+            wanted = None if columns is None else set()
+            rows = _iter_rows(source, wanted)
+            first = next(rows, None)
+            if first is None:
+                return pd.DataFrame()
+            header_row, header_cells, _ = first
+            header = _header_names(header_cells, shared_strings)
+            selected = [i for i, name in enumerate(header) if columns is None or name in columns]
+            if wanted is not None:
+                wanted.update(selected)
+            cells = {i: ([], [], [], []) for i in selected}
+
+            # Rows without any value, such as styled empty rows, do not extend the sheet past its data
+            last_row = header_row
+            for row_number, row_cells, filled in rows:
+                if filled:
+                    last_row = row_number
+                position = row_number - header_row - 1
+                for column, cell_type, style, text in row_cells:
+                    target = cells.get(column) or cells.setdefault(column, ([], [], [], []))
+                    target[0].append(position)
+                    target[1].append(cell_type)
+                    target[2].append(style)
+                    target[3].append(text)
+    file.seek(0)
+
+    # Values beyond the header get "Unnamed: N" columns, as pandas names them
+    if columns is None and cells and max(cells) >= len(header):
+        header += [f"Unnamed: {i}" for i in range(len(header), max(cells) + 1)]
+        selected = list(range(len(header)))
+    n_rows = last_row - header_row
+    empty = ([], [], [], [])
+    return pd.DataFrame({
+        header[i]: _column_values(*cells.get(i, empty), n_rows, shared_strings, date_styles, epoch) for i in selected
+    })